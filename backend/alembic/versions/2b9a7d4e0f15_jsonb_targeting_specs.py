@@ -0,0 +1,54 @@
+"""Store targeting specs as JSONB with GIN indexes
+
+Revision ID: 2b9a7d4e0f15
+Revises: 8e4f0b1d6a29
+Create Date: 2026-10-15 13:21:44.086172
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b9a7d4e0f15'
+down_revision: Union[str, None] = '8e4f0b1d6a29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = [('ad_sets', 'targeting_spec'), ('ad_sets', 'placements'), ('audiences', 'spec')]
+
+
+def upgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            postgresql_using=f'{column}::jsonb',
+        )
+    op.create_index(
+        'ix_ad_sets_targeting_spec', 'ad_sets', ['targeting_spec'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'targeting_spec': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'ix_audiences_spec', 'audiences', ['spec'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'spec': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audiences_spec', table_name='audiences')
+    op.drop_index('ix_ad_sets_targeting_spec', table_name='ad_sets')
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            postgresql_using=f'{column}::json',
+        )
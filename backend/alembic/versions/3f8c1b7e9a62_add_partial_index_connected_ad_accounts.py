@@ -0,0 +1,29 @@
+"""Add partial index on connected ad accounts
+
+Revision ID: 3f8c1b7e9a62
+Revises: e41a6c8f0d27
+Create Date: 2026-10-15 10:41:17.802356
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8c1b7e9a62'
+down_revision: Union[str, None] = 'e41a6c8f0d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_ad_accounts_connected', 'ad_accounts', ['client_id', 'platform'],
+        unique=False,
+        postgresql_where=sa.text("status = 'connected'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ad_accounts_connected', table_name='ad_accounts')
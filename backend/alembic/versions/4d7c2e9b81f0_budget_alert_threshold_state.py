@@ -0,0 +1,28 @@
+"""Track the last monthly budget alert threshold sent
+
+Revision ID: 4d7c2e9b81f0
+Revises: f6a3c0e8d271
+Create Date: 2026-10-15 14:12:53.604117
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d7c2e9b81f0'
+down_revision: Union[str, None] = 'f6a3c0e8d271'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'budget_settings',
+        sa.Column('last_alerted_threshold_pct', sa.Float(), server_default='0', nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('budget_settings', 'last_alerted_threshold_pct')
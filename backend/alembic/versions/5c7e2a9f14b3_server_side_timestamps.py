@@ -0,0 +1,53 @@
+"""Stamp created_at/updated_at on the database server
+
+Revision ID: 5c7e2a9f14b3
+Revises: a9d04f6b2e18
+Create Date: 2026-10-15 12:04:18.402671
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7e2a9f14b3'
+down_revision: Union[str, None] = 'a9d04f6b2e18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UPDATED_TABLES = [
+    'users', 'clients', 'ad_accounts', 'campaigns', 'ad_sets', 'ads',
+    'creatives', 'audiences', 'products', 'budget_settings',
+]
+CREATED_ONLY_TABLES = ['daily_metrics', 'optimization_logs']
+
+UTC_NOW = sa.text("timezone('utc', now())")
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = timezone('utc', now());
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in UPDATED_TABLES + CREATED_ONLY_TABLES:
+        op.alter_column(table, 'created_at', server_default=UTC_NOW)
+    for table in UPDATED_TABLES:
+        op.alter_column(table, 'updated_at', server_default=UTC_NOW)
+        op.execute(
+            f"CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    for table in UPDATED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}")
+        op.alter_column(table, 'updated_at', server_default=None)
+    for table in UPDATED_TABLES + CREATED_ONLY_TABLES:
+        op.alter_column(table, 'created_at', server_default=None)
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
@@ -0,0 +1,29 @@
+"""Unique ad account per client and platform
+
+Revision ID: 7b3e9d2a41c5
+Revises: 598e0a614996
+Create Date: 2026-10-15 09:12:03.418276
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9d2a41c5'
+down_revision: Union[str, None] = '598e0a614996'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_unique_constraint(
+        'uq_ad_accounts_client_platform_account',
+        'ad_accounts',
+        ['client_id', 'platform', 'account_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_ad_accounts_client_platform_account', 'ad_accounts', type_='unique')
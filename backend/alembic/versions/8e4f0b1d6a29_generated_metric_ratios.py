@@ -0,0 +1,52 @@
+"""Generate daily metrics ratio columns in Postgres
+
+Revision ID: 8e4f0b1d6a29
+Revises: d18b6f3a0c57
+Create Date: 2026-10-15 12:58:07.315226
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f0b1d6a29'
+down_revision: Union[str, None] = 'd18b6f3a0c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RATIOS = {
+    'ctr': "CASE WHEN impressions > 0 THEN clicks::float8 / impressions ELSE 0 END",
+    'cpc': "CASE WHEN clicks > 0 THEN spend / clicks ELSE 0 END",
+    'cpm': "CASE WHEN impressions > 0 THEN spend * 1000 / impressions ELSE 0 END",
+    'roas': "CASE WHEN spend > 0 THEN revenue / spend ELSE 0 END",
+    'cpa': "CASE WHEN conversions > 0 THEN spend / conversions ELSE 0 END",
+}
+COVERING_COLUMNS = ['spend', 'revenue', 'conversions', 'roas', 'clicks', 'impressions']
+
+
+def upgrade() -> None:
+    # The covering index includes roas, so it is rebuilt around the column swap
+    op.drop_index('ix_daily_metrics_client_date', table_name='daily_metrics')
+    for name, expression in RATIOS.items():
+        op.drop_column('daily_metrics', name)
+        op.add_column('daily_metrics', sa.Column(name, sa.Float(), sa.Computed(expression, persisted=True)))
+    op.create_index(
+        'ix_daily_metrics_client_date', 'daily_metrics', ['client_id', 'date'],
+        unique=False,
+        postgresql_include=COVERING_COLUMNS,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_daily_metrics_client_date', table_name='daily_metrics')
+    for name, expression in RATIOS.items():
+        op.drop_column('daily_metrics', name)
+        op.add_column('daily_metrics', sa.Column(name, sa.Float(), nullable=True))
+        op.execute(f"UPDATE daily_metrics SET {name} = {expression}")
+    op.create_index(
+        'ix_daily_metrics_client_date', 'daily_metrics', ['client_id', 'date'],
+        unique=False,
+        postgresql_include=COVERING_COLUMNS,
+    )
@@ -0,0 +1,46 @@
+"""Consolidate daily metrics and optimization log indexes
+
+Revision ID: a9d04f6b2e18
+Revises: 3f8c1b7e9a62
+Create Date: 2026-10-15 11:26:40.157903
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d04f6b2e18'
+down_revision: Union[str, None] = '3f8c1b7e9a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Covering index gains roas; single-column indexes are prefixes of composites
+    op.drop_index('ix_daily_metrics_client_date', table_name='daily_metrics')
+    op.create_index(
+        'ix_daily_metrics_client_date', 'daily_metrics', ['client_id', 'date'],
+        unique=False,
+        postgresql_include=['spend', 'revenue', 'conversions', 'roas', 'clicks', 'impressions'],
+    )
+    op.create_index('ix_daily_metrics_campaign_date', 'daily_metrics', ['campaign_id', 'date'], unique=False)
+    op.drop_index('ix_daily_metrics_client_id', table_name='daily_metrics')
+    op.drop_index('ix_daily_metrics_campaign_id', table_name='daily_metrics')
+    op.drop_index('ix_daily_metrics_date', table_name='daily_metrics')
+    op.drop_index('ix_optimization_logs_client_id', table_name='optimization_logs')
+
+
+def downgrade() -> None:
+    op.create_index('ix_optimization_logs_client_id', 'optimization_logs', ['client_id'], unique=False)
+    op.create_index('ix_daily_metrics_date', 'daily_metrics', ['date'], unique=False)
+    op.create_index('ix_daily_metrics_campaign_id', 'daily_metrics', ['campaign_id'], unique=False)
+    op.create_index('ix_daily_metrics_client_id', 'daily_metrics', ['client_id'], unique=False)
+    op.drop_index('ix_daily_metrics_campaign_date', table_name='daily_metrics')
+    op.drop_index('ix_daily_metrics_client_date', table_name='daily_metrics')
+    op.create_index(
+        'ix_daily_metrics_client_date', 'daily_metrics', ['client_id', 'date'],
+        unique=False,
+        postgresql_include=['spend', 'revenue', 'conversions', 'clicks', 'impressions'],
+    )
@@ -0,0 +1,30 @@
+"""Add partial index on active clients by automation status
+
+Revision ID: b5e81d3f6c40
+Revises: 4d7c2e9b81f0
+Create Date: 2026-10-15 14:31:06.284519
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e81d3f6c40'
+down_revision: Union[str, None] = '4d7c2e9b81f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_clients_active_automation_status', 'clients', ['automation_status'],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+        postgresql_include=['id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_clients_active_automation_status', table_name='clients')
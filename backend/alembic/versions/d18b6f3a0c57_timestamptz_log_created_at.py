@@ -0,0 +1,40 @@
+"""Store daily metrics and optimization log created_at as timestamptz
+
+Revision ID: d18b6f3a0c57
+Revises: 5c7e2a9f14b3
+Create Date: 2026-10-15 12:31:52.918440
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd18b6f3a0c57'
+down_revision: Union[str, None] = '5c7e2a9f14b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['daily_metrics', 'optimization_logs']
+
+
+def upgrade() -> None:
+    # Existing naive values were written as UTC
+    for table in TABLES:
+        op.alter_column(
+            table, 'created_at',
+            type_=sa.DateTime(timezone=True),
+            postgresql_using="created_at AT TIME ZONE 'UTC'",
+            server_default=sa.text('now()'),
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(
+            table, 'created_at',
+            type_=sa.DateTime(),
+            postgresql_using="created_at AT TIME ZONE 'UTC'",
+            server_default=sa.text("timezone('utc', now())"),
+        )
@@ -0,0 +1,35 @@
+"""Add composite indexes for hot query predicates
+
+Revision ID: e41a6c8f0d27
+Revises: 7b3e9d2a41c5
+Create Date: 2026-10-15 10:04:51.230914
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41a6c8f0d27'
+down_revision: Union[str, None] = '7b3e9d2a41c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_daily_metrics_client_date', 'daily_metrics', ['client_id', 'date'],
+        unique=False,
+        postgresql_include=['spend', 'revenue', 'conversions', 'clicks', 'impressions'],
+    )
+    op.create_index('ix_ad_accounts_client_status', 'ad_accounts', ['client_id', 'status'], unique=False)
+    op.create_index('ix_campaigns_client_status_platform', 'campaigns', ['client_id', 'status', 'platform'], unique=False)
+    op.create_index('ix_optimization_logs_client_created', 'optimization_logs', ['client_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_optimization_logs_client_created', table_name='optimization_logs')
+    op.drop_index('ix_campaigns_client_status_platform', table_name='campaigns')
+    op.drop_index('ix_ad_accounts_client_status', table_name='ad_accounts')
+    op.drop_index('ix_daily_metrics_client_date', table_name='daily_metrics')
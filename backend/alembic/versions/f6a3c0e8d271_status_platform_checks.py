@@ -0,0 +1,43 @@
+"""Constrain status and platform columns to their known values
+
+Revision ID: f6a3c0e8d271
+Revises: 2b9a7d4e0f15
+Create Date: 2026-10-15 13:47:29.551038
+"""
+
+from typing import Sequence, Union
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a3c0e8d271'
+down_revision: Union[str, None] = '2b9a7d4e0f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PLATFORMS = ('meta', 'google', 'ga4')
+AD_STATUSES = ('draft', 'active', 'paused', 'rejected')
+
+CHECKS = [
+    ('ads', 'status', AD_STATUSES),
+    ('ad_sets', 'status', AD_STATUSES),
+    ('ad_accounts', 'platform', PLATFORMS),
+    ('ad_accounts', 'status', ('connected', 'disconnected', 'error')),
+    ('audiences', 'platform', PLATFORMS),
+    ('campaigns', 'platform', PLATFORMS),
+    ('campaigns', 'status', ('draft', 'active', 'paused', 'completed', 'error')),
+    ('creatives', 'status', ('active', 'fatigued', 'archived')),
+    ('daily_metrics', 'platform', PLATFORMS),
+    ('optimization_logs', 'status', ('completed', 'failed', 'pending')),
+]
+
+
+def upgrade() -> None:
+    for table, column, values in CHECKS:
+        allowed = ", ".join(f"'{v}'" for v in values)
+        op.create_check_constraint(f'ck_{table}_{column}', table, f'{column} IN ({allowed})')
+
+
+def downgrade() -> None:
+    for table, column, _ in reversed(CHECKS):
+        op.drop_constraint(f'ck_{table}_{column}', table, type_='check')
@@ -1,57 +1,72 @@
 """Ad Account connection API routes - OAuth flows for Meta & Google."""
 
+import logging
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List
-from urllib.parse import urlencode
+from urllib.parse import urlencode, quote
+from uuid import UUID
 
 from app.database import get_db
-from app.models.user import User
 from app.models.client import Client
 from app.models.ad_account import AdAccount
 from app.schemas.ad_account import AdAccountResponse, OAuthURLResponse
-from app.utils.security import get_current_user
+from app.deps import current_client, active_client_stmt
 from app.config import settings
 from app.services.meta_ads import MetaAdsService
 from app.services.google_ads import GoogleAdsService
+from app.utils.helpers import token_expiry
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
+router = APIRouter()
 
-async def _get_client(user: User, db: AsyncSession) -> Client:
-    result = await db.execute(
-        select(Client).where(Client.user_id == user.id, Client.is_active == True)
+_ad_account_list = TypeAdapter(List[AdAccountResponse])
+
+# Static OAuth query parameters, encoded once at import
+_META_AUTH_URL = "https://www.facebook.com/v18.0/dialog/oauth?" + urlencode({
+    "redirect_uri": settings.META_REDIRECT_URI,
+    "scope": "ads_management,ads_read,business_management",
+    "response_type": "code",
+})
+_GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth?" + urlencode({
+    "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+    "scope": "https://www.googleapis.com/auth/adwords https://www.googleapis.com/auth/analytics.readonly",
+    "response_type": "code",
+    "access_type": "offline",
+    "prompt": "consent",
+})
+
+
+async def _upsert_ad_accounts(db: AsyncSession, rows: list[dict], update_columns: list[str]):
+    """Insert ad accounts, refreshing tokens on ones already linked to the client."""
+    if not rows:
+        return
+    stmt = pg_insert(AdAccount).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_ad_accounts_client_platform_account",
+        set_={
+            **{col: stmt.excluded[col] for col in update_columns},
+            "status": "connected",
+        },
     )
-    client = result.scalar_one_or_none()
-    if not client:
-        raise HTTPException(status_code=404, detail="No active client found")
-    return client
+    await db.execute(stmt)
 
 
 # ─── Meta Ads OAuth ──────────────────────────────────────────────
 
 @router.get("/meta/connect", response_model=OAuthURLResponse)
-async def meta_connect(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
+async def meta_connect(client: Client = Depends(current_client)):
     """Generate Meta OAuth authorization URL using client credentials."""
-    client = await _get_client(current_user, db)
-    
     app_id = client.meta_app_id or settings.META_APP_ID
     if not app_id:
         raise HTTPException(status_code=400, detail="Meta App ID not configured for this client")
 
-    params = {
-        "client_id": app_id,
-        "redirect_uri": settings.META_REDIRECT_URI,
-        "scope": "ads_management,ads_read,business_management",
-        "response_type": "code",
-        "state": str(current_user.id),
-    }
-    auth_url = f"https://www.facebook.com/v18.0/dialog/oauth?{urlencode(params)}"
+    auth_url = f"{_META_AUTH_URL}&client_id={quote(app_id, safe='')}&state={client.user_id}"
     return OAuthURLResponse(auth_url=auth_url)
 
 
@@ -63,13 +78,10 @@ async def meta_callback(
 ):
     """Handle Meta OAuth callback - exchange code for tokens."""
     try:
-        from uuid import UUID
         user_id = UUID(state)
         
         # Get user's client
-        result = await db.execute(
-            select(Client).where(Client.user_id == user_id, Client.is_active == True)
-        )
+        result = await db.execute(active_client_stmt(user_id))
         client = result.scalar_one_or_none()
         if not client:
             raise HTTPException(status_code=400, detail="Invalid state parameter")
@@ -84,60 +96,41 @@ async def meta_callback(
         # Get ad accounts for this user
         accounts = await meta_service.get_ad_accounts(token_data["access_token"])
 
-        # Store each ad account
-        for acct in accounts:
-            existing = await db.execute(
-                select(AdAccount).where(
-                    AdAccount.client_id == client.id,
-                    AdAccount.platform == "meta",
-                    AdAccount.account_id == acct["id"],
-                )
-            )
-            ad_account = existing.scalar_one_or_none()
-            if ad_account:
-                ad_account.access_token = token_data["access_token"]
-                ad_account.status = "connected"
-            else:
-                ad_account = AdAccount(
-                    client_id=client.id,
-                    platform="meta",
-                    account_id=acct["id"],
-                    account_name=acct.get("name", "Meta Ad Account"),
-                    access_token=token_data["access_token"],
-                )
-                db.add(ad_account)
+        # Store all ad accounts in a single upsert
+        await _upsert_ad_accounts(
+            db,
+            [
+                {
+                    "client_id": client.id,
+                    "platform": "meta",
+                    "account_id": acct["id"],
+                    "account_name": acct.get("name", "Meta Ad Account"),
+                    "access_token": token_data["access_token"],
+                    "token_expires_at": token_expiry(token_data.get("expires_in")),
+                }
+                for acct in accounts
+            ],
+            update_columns=["access_token", "token_expires_at"],
+        )
 
         # Redirect to frontend success page
         return RedirectResponse(url="http://localhost:3001/setup?meta=connected")
 
     except Exception as e:
-        return RedirectResponse(url=f"http://localhost:3001/setup?meta=error&msg={str(e)}")
+        logger.exception("Meta OAuth callback failed")
+        return RedirectResponse(url=f"http://localhost:3001/setup?meta=error&msg={quote(type(e).__name__)}")
 
 
 # ─── Google Ads OAuth ────────────────────────────────────────────
 
 @router.get("/google/connect", response_model=OAuthURLResponse)
-async def google_connect(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
+async def google_connect(client: Client = Depends(current_client)):
     """Generate Google Ads OAuth authorization URL using client credentials."""
-    client = await _get_client(current_user, db)
-
     client_id = client.google_client_id or settings.GOOGLE_CLIENT_ID
     if not client_id:
         raise HTTPException(status_code=400, detail="Google Client ID not configured for this client")
 
-    params = {
-        "client_id": client_id,
-        "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-        "scope": "https://www.googleapis.com/auth/adwords https://www.googleapis.com/auth/analytics.readonly",
-        "response_type": "code",
-        "access_type": "offline",
-        "prompt": "consent",
-        "state": str(current_user.id),
-    }
-    auth_url = f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(params)}"
+    auth_url = f"{_GOOGLE_AUTH_URL}&client_id={quote(client_id, safe='')}&state={client.user_id}"
     return OAuthURLResponse(auth_url=auth_url)
 
 
@@ -149,13 +142,10 @@ async def google_callback(
 ):
     """Handle Google OAuth callback."""
     try:
-        from uuid import UUID
         user_id = UUID(state)
 
         # Get user's client
-        result = await db.execute(
-            select(Client).where(Client.user_id == user_id, Client.is_active == True)
-        )
+        result = await db.execute(active_client_stmt(user_id))
         client = result.scalar_one_or_none()
         if not client:
             raise HTTPException(status_code=400, detail="Invalid state parameter")
@@ -171,46 +161,39 @@ async def google_callback(
         # Get accessible customer IDs
         customers = await google_service.get_accessible_customers(token_data["access_token"])
 
-        for customer_id in customers:
-            existing = await db.execute(
-                select(AdAccount).where(
-                    AdAccount.client_id == client.id,
-                    AdAccount.platform == "google",
-                    AdAccount.account_id == customer_id,
-                )
-            )
-            ad_account = existing.scalar_one_or_none()
-            if ad_account:
-                ad_account.access_token = token_data["access_token"]
-                ad_account.refresh_token = token_data.get("refresh_token")
-                ad_account.status = "connected"
-            else:
-                ad_account = AdAccount(
-                    client_id=client.id,
-                    platform="google",
-                    account_id=customer_id,
-                    account_name=f"Google Ads {customer_id}",
-                    access_token=token_data["access_token"],
-                    refresh_token=token_data.get("refresh_token"),
-                )
-                db.add(ad_account)
+        await _upsert_ad_accounts(
+            db,
+            [
+                {
+                    "client_id": client.id,
+                    "platform": "google",
+                    "account_id": customer_id,
+                    "account_name": f"Google Ads {customer_id}",
+                    "access_token": token_data["access_token"],
+                    "refresh_token": token_data.get("refresh_token"),
+                    "token_expires_at": token_expiry(token_data.get("expires_in")),
+                }
+                for customer_id in customers
+            ],
+            update_columns=["access_token", "refresh_token", "token_expires_at"],
+        )
 
         return RedirectResponse(url="http://localhost:3001/setup?google=connected")
 
     except Exception as e:
-        return RedirectResponse(url=f"http://localhost:3001/setup?google=error&msg={str(e)}")
+        logger.exception("Google OAuth callback failed")
+        return RedirectResponse(url=f"http://localhost:3001/setup?google=error&msg={quote(type(e).__name__)}")
 
 
 # ─── List Connected Accounts ────────────────────────────────────
 
 @router.get("", response_model=List[AdAccountResponse])
 async def list_ad_accounts(
-    current_user: User = Depends(get_current_user),
+    client: Client = Depends(current_client),
     db: AsyncSession = Depends(get_db),
 ):
     """List all connected ad accounts for the current user's client."""
-    client = await _get_client(current_user, db)
     result = await db.execute(
         select(AdAccount).where(AdAccount.client_id == client.id)
     )
-    return result.scalars().all()
+    return ORJSONResponse(_ad_account_list.dump_python(_ad_account_list.validate_python(result.scalars().all())))
@@ -1,39 +1,30 @@
 """Automation control API routes."""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func
 from typing import List
 
 from app.database import get_db
-from app.models.user import User
 from app.models.client import Client, AutomationStatus
 from app.models.ad_account import AdAccount
 from app.models.optimization_log import OptimizationLog
 from app.schemas.campaign import OptimizationLogResponse
-from app.utils.security import get_current_user
+from app.deps import current_client
 
 router = APIRouter()
 
-
-async def _get_client(user: User, db: AsyncSession) -> Client:
-    result = await db.execute(
-        select(Client).where(Client.user_id == user.id, Client.is_active == True)
-    )
-    client = result.scalar_one_or_none()
-    if not client:
-        raise HTTPException(status_code=404, detail="No active client found")
-    return client
+_log_list = TypeAdapter(List[OptimizationLogResponse])
 
 
 @router.post("/deploy")
 async def deploy_automation(
-    current_user: User = Depends(get_current_user),
+    client: Client = Depends(current_client),
     db: AsyncSession = Depends(get_db),
 ):
     """Deploy full automation: collect data → generate strategy → create campaigns."""
-    client = await _get_client(current_user, db)
-
     # Verify at least one ad account is connected
     result = await db.execute(
         select(AdAccount).where(
@@ -85,12 +76,10 @@ async def deploy_automation(
 
 @router.post("/pause")
 async def pause_automation(
-    current_user: User = Depends(get_current_user),
+    client: Client = Depends(current_client),
     db: AsyncSession = Depends(get_db),
 ):
     """Pause all automation for the current client."""
-    client = await _get_client(current_user, db)
-
     if client.automation_status == AutomationStatus.INACTIVE:
         raise HTTPException(status_code=400, detail="Automation is not active")
 
@@ -109,12 +98,10 @@ async def pause_automation(
 
 @router.post("/resume")
 async def resume_automation(
-    current_user: User = Depends(get_current_user),
+    client: Client = Depends(current_client),
     db: AsyncSession = Depends(get_db),
 ):
     """Resume paused automation."""
-    client = await _get_client(current_user, db)
-
     if client.automation_status != AutomationStatus.PAUSED:
         raise HTTPException(status_code=400, detail="Automation is not paused")
 
@@ -133,28 +120,26 @@ async def resume_automation(
 
 @router.get("/status")
 async def get_automation_status(
-    current_user: User = Depends(get_current_user),
+    client: Client = Depends(current_client),
     db: AsyncSession = Depends(get_db),
 ):
     """Get current automation status."""
-    client = await _get_client(current_user, db)
-
-    # Count connected accounts
+    # Count connected accounts per platform
     result = await db.execute(
-        select(AdAccount).where(
+        select(AdAccount.platform, func.count().label("n")).where(
             AdAccount.client_id == client.id,
             AdAccount.status == "connected",
-        )
+        ).group_by(AdAccount.platform)
     )
-    accounts = result.scalars().all()
+    counts = {row.platform: row.n for row in result.all()}
 
     return {
         "automation_status": client.automation_status.value if hasattr(client.automation_status, 'value') else str(client.automation_status),
         "monthly_budget": client.monthly_budget,
         "country": client.country,
         "connected_accounts": {
-            "meta": sum(1 for a in accounts if a.platform == "meta"),
-            "google": sum(1 for a in accounts if a.platform == "google"),
+            "meta": counts.get("meta", 0),
+            "google": counts.get("google", 0),
         },
     }
 
@@ -163,12 +148,10 @@ async def get_automation_status(
 async def get_optimization_logs(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
+    client: Client = Depends(current_client),
     db: AsyncSession = Depends(get_db),
 ):
     """Get optimization action logs."""
-    client = await _get_client(current_user, db)
-
     result = await db.execute(
         select(OptimizationLog)
         .where(OptimizationLog.client_id == client.id)
@@ -176,4 +159,4 @@ async def get_optimization_logs(
         .offset(offset)
         .limit(limit)
     )
-    return result.scalars().all()
+    return ORJSONResponse(_log_list.dump_python(_log_list.validate_python(result.scalars().all())))
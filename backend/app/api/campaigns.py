@@ -1,28 +1,23 @@
 """Campaign listing API routes."""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from typing import Optional
+from typing import Optional, List
+from uuid import UUID
 
 from app.database import get_db
-from app.models.user import User
 from app.models.client import Client
 from app.models.campaign import Campaign
 from app.schemas.campaign import CampaignResponse, CampaignListResponse
-from app.utils.security import get_current_user
+from app.deps import current_client
 
 router = APIRouter()
 
-
-async def _get_client(user: User, db: AsyncSession) -> Client:
-    result = await db.execute(
-        select(Client).where(Client.user_id == user.id, Client.is_active == True)
-    )
-    client = result.scalar_one_or_none()
-    if not client:
-        raise HTTPException(status_code=404, detail="No active client found")
-    return client
+# Validates a whole page in one pydantic-core call instead of per-row model_validate
+_campaign_list = TypeAdapter(List[CampaignResponse])
 
 
 @router.get("", response_model=CampaignListResponse)
@@ -31,43 +26,49 @@ async def list_campaigns(
     platform: Optional[str] = Query(None, description="Filter by platform"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
+    client: Client = Depends(current_client),
     db: AsyncSession = Depends(get_db),
 ):
     """List campaigns for the current client."""
-    client = await _get_client(current_user, db)
-
-    query = select(Campaign).where(Campaign.client_id == client.id)
-    count_query = select(func.count(Campaign.id)).where(Campaign.client_id == client.id)
-
+    filters = [Campaign.client_id == client.id]
     if status:
-        query = query.where(Campaign.status == status)
-        count_query = count_query.where(Campaign.status == status)
+        filters.append(Campaign.status == status)
     if platform:
-        query = query.where(Campaign.platform == platform)
-        count_query = count_query.where(Campaign.platform == platform)
-
-    query = query.order_by(Campaign.created_at.desc()).offset(offset).limit(limit)
+        filters.append(Campaign.platform == platform)
+
+    # The window count rides along with the page, so rows + total is one round-trip
+    query = (
+        select(Campaign, func.count().over().label("total"))
+        .where(*filters)
+        .order_by(Campaign.created_at.desc())
+        .offset(offset)
+        .limit(limit)
+    )
 
     result = await db.execute(query)
-    campaigns = result.scalars().all()
+    rows = result.all()
+    campaigns = [row.Campaign for row in rows]
+    total = rows[0].total if rows else 0
 
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
+    # An offset past the end returns no rows to carry the window count;
+    # on the first page an empty result already means zero
+    if not rows and offset > 0:
+        total = (await db.execute(select(func.count(Campaign.id)).where(*filters))).scalar()
 
-    return CampaignListResponse(campaigns=campaigns, total=total)
+    # Rows are serialized once here; returning a response skips FastAPI's re-validation
+    return ORJSONResponse({
+        "campaigns": _campaign_list.dump_python(_campaign_list.validate_python(campaigns)),
+        "total": total,
+    })
 
 
 @router.get("/{campaign_id}", response_model=CampaignResponse)
 async def get_campaign(
     campaign_id: str,
-    current_user: User = Depends(get_current_user),
+    client: Client = Depends(current_client),
     db: AsyncSession = Depends(get_db),
 ):
     """Get a single campaign by ID."""
-    from uuid import UUID
-    client = await _get_client(current_user, db)
-
     result = await db.execute(
         select(Campaign).where(
             Campaign.id == UUID(campaign_id),
@@ -1,50 +1,40 @@
 """Dashboard API routes - aggregated metrics and performance data."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import numpy as np
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from datetime import date, timedelta
 
-from app.database import get_db
-from app.models.user import User
+from app.database import get_db, AsyncSessionLocal
 from app.models.client import Client
 from app.models.campaign import Campaign
 from app.models.daily_metrics import DailyMetrics
 from app.models.budget_settings import BudgetSettings
 from app.models.optimization_log import OptimizationLog
 from app.schemas.dashboard import MetricsSummary, DailyMetricPoint, DailyMetricsResponse, DashboardOverview, TopCampaign
-from app.utils.security import get_current_user
+from app.deps import current_client
 from app.utils.helpers import safe_divide
 
 router = APIRouter()
 
 
-async def _get_client(user: User, db: AsyncSession) -> Client:
-    result = await db.execute(
-        select(Client).where(Client.user_id == user.id, Client.is_active == True)
-    )
-    client = result.scalar_one_or_none()
-    if not client:
-        raise HTTPException(status_code=404, detail="No active client found")
-    return client
-
-
-@router.get("/metrics", response_model=MetricsSummary)
-async def get_metrics_summary(
-    days: int = Query(30, ge=1, le=90),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    """Get aggregated metrics for the last N days."""
-    client = await _get_client(current_user, db)
+async def _metrics_summary(client: Client, db: AsyncSession, days: int) -> MetricsSummary:
+    """Aggregate metrics for the last N days."""
     start_date = date.today() - timedelta(days=days)
 
+    # Budget figures ride along as scalar subqueries so /metrics is one round-trip
+    budget_filter = BudgetSettings.client_id == client.id
     result = await db.execute(
         select(
             func.coalesce(func.sum(DailyMetrics.spend), 0).label("total_spend"),
             func.coalesce(func.sum(DailyMetrics.revenue), 0).label("total_revenue"),
             func.coalesce(func.sum(DailyMetrics.conversions), 0).label("total_conversions"),
-            func.coalesce(func.avg(DailyMetrics.ctr), 0).label("avg_ctr"),
+            func.coalesce(func.sum(DailyMetrics.clicks), 0).label("total_clicks"),
+            func.coalesce(func.sum(DailyMetrics.impressions), 0).label("total_impressions"),
+            select(BudgetSettings.monthly_cap).where(budget_filter).scalar_subquery().label("monthly_cap"),
+            select(BudgetSettings.current_month_spend).where(budget_filter).scalar_subquery().label("current_month_spend"),
         ).where(
             DailyMetrics.client_id == client.id,
             DailyMetrics.date >= start_date,
@@ -57,12 +47,8 @@ async def get_metrics_summary(
     total_conversions = int(row.total_conversions)
 
     # Budget usage
-    budget_result = await db.execute(
-        select(BudgetSettings).where(BudgetSettings.client_id == client.id)
-    )
-    budget = budget_result.scalar_one_or_none()
-    monthly_budget = budget.monthly_cap if budget else 0
-    budget_usage = safe_divide(budget.current_month_spend, monthly_budget) * 100 if budget else 0
+    monthly_budget = float(row.monthly_cap or 0)
+    budget_usage = safe_divide(float(row.current_month_spend or 0), monthly_budget) * 100
 
     return MetricsSummary(
         total_spend=total_spend,
@@ -70,20 +56,14 @@ async def get_metrics_summary(
         total_conversions=total_conversions,
         avg_roas=safe_divide(total_revenue, total_spend),
         avg_cpa=safe_divide(total_spend, total_conversions),
-        avg_ctr=float(row.avg_ctr),
+        avg_ctr=safe_divide(int(row.total_clicks), int(row.total_impressions)),
         budget_usage_pct=budget_usage,
         monthly_budget=monthly_budget,
     )
 
 
-@router.get("/daily", response_model=DailyMetricsResponse)
-async def get_daily_metrics(
-    days: int = Query(30, ge=1, le=90),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    """Get daily time-series metrics."""
-    client = await _get_client(current_user, db)
+async def _daily_metrics(client: Client, db: AsyncSession, days: int) -> DailyMetricsResponse:
+    """Build the daily time-series for the last N days."""
     start_date = date.today() - timedelta(days=days)
 
     result = await db.execute(
@@ -100,81 +80,131 @@ async def get_daily_metrics(
         ).group_by(DailyMetrics.date).order_by(DailyMetrics.date)
     )
 
-    data = []
-    for row in result.all():
-        spend = float(row.spend or 0)
-        revenue = float(row.revenue or 0)
-        conversions = int(row.conversions or 0)
-        data.append(DailyMetricPoint(
-            date=row.date,
-            spend=spend,
-            revenue=revenue,
-            conversions=conversions,
-            roas=safe_divide(revenue, spend),
-            cpa=safe_divide(spend, conversions),
-            clicks=int(row.clicks or 0),
-            impressions=int(row.impressions or 0),
-        ))
+    rows = result.all()
+    if not rows:
+        return DailyMetricsResponse(data=[], period_days=days)
 
-    return DailyMetricsResponse(data=data, period_days=days)
+    def column(name: str) -> np.ndarray:
+        return np.fromiter((getattr(r, name) or 0 for r in rows), dtype=np.float64, count=len(rows))
 
+    spend = column("spend")
+    revenue = column("revenue")
+    conversions = column("conversions")
+    roas = np.divide(revenue, spend, out=np.zeros_like(revenue), where=spend != 0)
+    cpa = np.divide(spend, conversions, out=np.zeros_like(spend), where=conversions != 0)
 
-@router.get("/overview", response_model=DashboardOverview)
-async def get_dashboard_overview(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    """Get full dashboard overview combining all data."""
-    client = await _get_client(current_user, db)
+    data = [
+        DailyMetricPoint(
+            date=row.date,
+            spend=s,
+            revenue=rv,
+            conversions=int(cv),
+            roas=ro,
+            cpa=cp,
+            clicks=int(cl),
+            impressions=int(im),
+        )
+        for row, s, rv, cv, ro, cp, cl, im in zip(
+            rows, spend.tolist(), revenue.tolist(), conversions.tolist(),
+            roas.tolist(), cpa.tolist(), column("clicks").tolist(), column("impressions").tolist(),
+        )
+    ]
 
-    # Get summary
-    summary = await get_metrics_summary(days=30, current_user=current_user, db=db)
+    return DailyMetricsResponse(data=data, period_days=days)
 
-    # Get daily metrics
-    daily = await get_daily_metrics(days=30, current_user=current_user, db=db)
 
-    # Top campaigns by ROAS
-    start_date = date.today() - timedelta(days=30)
-    top_result = await db.execute(
+async def _top_campaigns(client: Client, db: AsyncSession, days: int) -> list[TopCampaign]:
+    """Top campaigns by ROAS for the last N days."""
+    start_date = date.today() - timedelta(days=days)
+    spend = func.sum(DailyMetrics.spend)
+    revenue = func.sum(DailyMetrics.revenue)
+    roas = func.coalesce(revenue / func.nullif(spend, 0), 0)
+    result = await db.execute(
         select(
             Campaign.id,
             Campaign.name,
             Campaign.platform,
             Campaign.status,
-            func.sum(DailyMetrics.spend).label("spend"),
-            func.sum(DailyMetrics.revenue).label("revenue"),
+            spend.label("spend"),
+            revenue.label("revenue"),
             func.sum(DailyMetrics.conversions).label("conversions"),
+            roas.label("roas"),
         ).join(
             DailyMetrics, DailyMetrics.campaign_id == Campaign.id
         ).where(
             Campaign.client_id == client.id,
             DailyMetrics.date >= start_date,
-        ).group_by(Campaign.id).order_by(func.sum(DailyMetrics.revenue).desc()).limit(10)
+        ).group_by(
+            Campaign.id, Campaign.name, Campaign.platform, Campaign.status
+        ).order_by(roas.desc()).limit(10)
     )
 
-    top_campaigns = []
-    for row in top_result.all():
-        spend = float(row.spend or 0)
-        revenue = float(row.revenue or 0)
-        top_campaigns.append(TopCampaign(
+    return [
+        TopCampaign(
             campaign_id=str(row.id),
             name=row.name,
             platform=row.platform,
-            spend=spend,
-            revenue=revenue,
-            roas=safe_divide(revenue, spend),
+            spend=float(row.spend or 0),
+            revenue=float(row.revenue or 0),
+            roas=float(row.roas),
             conversions=int(row.conversions or 0),
             status=row.status,
-        ))
+        )
+        for row in result.all()
+    ]
 
-    # Recent optimization actions count
-    actions_result = await db.execute(
+
+async def _recent_actions(client: Client, db: AsyncSession, days: int) -> int:
+    """Count optimization actions logged in the last N days."""
+    start_date = date.today() - timedelta(days=days)
+    result = await db.execute(
         select(func.count(OptimizationLog.id)).where(
             OptimizationLog.client_id == client.id,
             OptimizationLog.created_at >= start_date,
         )
     )
-    recent_actions = actions_result.scalar() or 0
+    return result.scalar() or 0
+
+
+async def _in_session(fn, client: Client, days: int):
+    """Run a dashboard helper on its own session so helpers can run concurrently."""
+    async with AsyncSessionLocal() as db:
+        return await fn(client, db, days)
+
+
+@router.get("/metrics", response_model=MetricsSummary)
+async def get_metrics_summary(
+    days: int = Query(30, ge=1, le=90),
+    client: Client = Depends(current_client),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get aggregated metrics for the last N days."""
+    return await _metrics_summary(client, db, days)
+
+
+@router.get("/daily", response_model=DailyMetricsResponse)
+async def get_daily_metrics(
+    days: int = Query(30, ge=1, le=90),
+    client: Client = Depends(current_client),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get daily time-series metrics."""
+    return await _daily_metrics(client, db, days)
+
+
+@router.get("/overview", response_model=DashboardOverview)
+async def get_dashboard_overview(
+    client: Client = Depends(current_client),
+):
+    """Get full dashboard overview combining all data."""
+    # An AsyncSession serializes statements, so each independent query
+    # gets its own session and the round-trips overlap.
+    summary, daily, top_campaigns, recent_actions = await asyncio.gather(
+        _in_session(_metrics_summary, client, 30),
+        _in_session(_daily_metrics, client, 30),
+        _in_session(_top_campaigns, client, 30),
+        _in_session(_recent_actions, client, 30),
+    )
 
     return DashboardOverview(
         summary=summary,
@@ -1,26 +1,68 @@
-"""Webhook handlers for external notifications."""
+"""Webhook handlers for external notifications.
+
+Handlers are ``async def`` and must only await non-blocking I/O or do short
+in-memory work; blocking or heavy CPU steps are pushed off the event loop
+with ``asyncio.to_thread`` instead of turning the handler into a sync ``def``.
+"""
+
+import asyncio
+import hashlib
+import hmac
+from typing import Optional
 
 from fastapi import APIRouter, Request, HTTPException
-import json
+import msgspec
+
+from app.config import settings
+from app.schemas.webhook import meta_event_decoder
 
 router = APIRouter()
 
+# Payloads above this size are hashed in a worker thread (hashlib releases the GIL)
+_OFFLOAD_HASH_BYTES = 64 * 1024
+
+# Settings are built once per process, so the HMAC key is encoded once too
+_META_APP_SECRET = (settings.META_APP_SECRET or "").encode()
+
+
+def verify_meta_signature(raw_body: bytes, signature: Optional[str]) -> bool:
+    """Check Meta's X-Hub-Signature-256 header against the app secret."""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    # One-shot hmac.digest stays in OpenSSL's C path (SHA extensions where available)
+    expected = hmac.digest(_META_APP_SECRET, raw_body, hashlib.sha256).hex()
+    return hmac.compare_digest(signature[len("sha256="):], expected)
+
 
 @router.post("/meta")
 async def meta_webhook(request: Request):
     """Handle Meta webhook notifications (ad status changes, etc.)."""
+    raw_body = await request.body()
+
+    if _META_APP_SECRET:
+        signature = request.headers.get("X-Hub-Signature-256")
+        if len(raw_body) > _OFFLOAD_HASH_BYTES:
+            valid = await asyncio.to_thread(verify_meta_signature, raw_body, signature)
+        else:
+            valid = verify_meta_signature(raw_body, signature)
+        if not valid:
+            raise HTTPException(status_code=403, detail="Invalid signature")
+
     try:
-        body = await request.json()
-        # Process webhook payload
-        # In production: validate signature, process events
-        return {"status": "received"}
-    except Exception as e:
+        # Decoded for validation only until the entries are processed
+        meta_event_decoder.decode(raw_body)
+    except msgspec.DecodeError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    # Process webhook payload
+    # In production: process event.entry changes
+    return {"status": "received"}
+
 
 @router.get("/meta")
 async def meta_webhook_verify(request: Request):
     """Meta webhook verification endpoint."""
+    # Pure in-memory work: stays async so it never takes a threadpool hop
     mode = request.query_params.get("hub.mode")
     token = request.query_params.get("hub.verify_token")
     challenge = request.query_params.get("hub.challenge")
@@ -1,15 +1,40 @@
 """SQLAlchemy async database engine and session management."""
 
+from uuid import uuid4
+
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 from app.config import settings
 
+_database_url = make_url(settings.DATABASE_URL).set(drivername=f"postgresql+{settings.DATABASE_DRIVER}")
+
+if settings.DATABASE_USE_PGBOUNCER or settings.DATABASE_DRIVER == "psqlpy":
+    # PgBouncer (transaction mode) and psqlpy's Rust pool already pool connections;
+    # every checkout is a fresh connection, so a pre-ping would only add a round trip
+    _pool_kwargs = {"poolclass": NullPool}
+    if settings.DATABASE_USE_PGBOUNCER and settings.DATABASE_DRIVER == "asyncpg":
+        # Consecutive transactions may land on different server connections, so
+        # asyncpg must not cache prepared statements or reuse their names
+        _pool_kwargs["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+else:
+    _pool_kwargs = {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
 engine = create_async_engine(
-    settings.DATABASE_URL,
+    _database_url,
     echo=settings.DEBUG,
-    pool_size=20,
-    max_overflow=10,
-    pool_pre_ping=True,
+    **_pool_kwargs,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -20,7 +45,9 @@ AsyncSessionLocal = async_sessionmaker(
 
 
 class Base(DeclarativeBase):
-    pass
+    # Fetch server-generated timestamps via RETURNING instead of expiring them,
+    # which would otherwise force a lazy load that async sessions cannot do.
+    __mapper_args__ = {"eager_defaults": True}
 
 
 async def get_db():
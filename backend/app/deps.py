@@ -0,0 +1,43 @@
+"""Shared FastAPI dependencies."""
+
+from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, lambda_stmt
+from sqlalchemy.orm import joinedload
+
+from app.database import get_db
+from app.models.user import User
+from app.models.client import Client
+from app.utils.security import get_current_user
+
+
+def active_client_stmt(user_id, with_budget: bool = False):
+    """Lookup of a user's active client, compiled once and cached by SQLAlchemy."""
+    stmt = lambda_stmt(lambda: select(Client).where(Client.user_id == user_id, Client.is_active == True))
+    if with_budget:
+        stmt += lambda s: s.options(joinedload(Client.budget_settings))
+    return stmt
+
+
+async def _load_client(user: User, db: AsyncSession, with_budget: bool = False) -> Client:
+    result = await db.execute(active_client_stmt(user.id, with_budget))
+    client = result.scalar_one_or_none()
+    if not client:
+        raise HTTPException(status_code=404, detail="No active client found")
+    return client
+
+
+async def current_client(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Client:
+    """Active client for the current user, resolved once per request."""
+    return await _load_client(current_user, db)
+
+
+async def current_client_with_budget(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Client:
+    """Active client with its budget settings joined into the same query."""
+    return await _load_client(current_user, db, with_budget=True)
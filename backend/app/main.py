@@ -1,28 +1,50 @@
 """FAGE - Fibonce Autonomous Growth Engine: FastAPI Application Entry Point."""
 
 from contextlib import asynccontextmanager
+import orjson
 from fastapi import FastAPI
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.config import settings
 from app.api import auth, clients, campaigns, dashboard, ad_accounts, automation
 from app.tasks.scheduler import start_scheduler, shutdown_scheduler
+from app.services.alert_service import close_smtp, start_alert_dispatcher, stop_alert_dispatcher
+from app.utils.http import close_http_client
+
+
+OPENAPI_URL = "/openapi.json"
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
+    # AsyncIOScheduler binds to the running loop and only registers in-memory
+    # jobs here, so it must start on the loop thread (not via to_thread)
     start_scheduler()
+    start_alert_dispatcher()
+    # Routes are fixed once mounted: build the schema and docs pages a single time
+    app.state.openapi_bytes = orjson.dumps(app.openapi())
+    app.state.docs_html = get_swagger_ui_html(openapi_url=OPENAPI_URL, title=f"{settings.APP_NAME} - Swagger UI").body
+    app.state.redoc_html = get_redoc_html(openapi_url=OPENAPI_URL, title=f"{settings.APP_NAME} - ReDoc").body
     yield
     shutdown_scheduler()
+    await stop_alert_dispatcher()
+    await close_http_client()
+    await close_smtp()
 
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     lifespan=lifespan,
-    docs_url="/docs",
-    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    # Served below from bytes prepared in lifespan
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
 )
 
 # CORS
@@ -34,6 +56,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Dashboard and list payloads are repetitive JSON; skip tiny responses
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Mount routers
 app.include_router(auth.router, prefix=f"{settings.API_PREFIX}/auth", tags=["Authentication"])
 app.include_router(clients.router, prefix=f"{settings.API_PREFIX}/clients", tags=["Clients"])
@@ -43,6 +68,21 @@ app.include_router(dashboard.router, prefix=f"{settings.API_PREFIX}/dashboard",
 app.include_router(automation.router, prefix=f"{settings.API_PREFIX}/automation", tags=["Automation"])
 
 
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json():
+    return Response(content=app.state.openapi_bytes, media_type="application/json")
+
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_docs():
+    return HTMLResponse(content=app.state.docs_html)
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_docs():
+    return HTMLResponse(content=app.state.redoc_html)
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "app": settings.APP_NAME, "version": settings.APP_VERSION}
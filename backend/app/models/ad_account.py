@@ -1,27 +1,42 @@
 """Ad Account model - stores connected Meta/Google ad accounts."""
 
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.types import EncryptedToken, uuid7, UTC_NOW, UPDATED_BY_TRIGGER, Platform, checked_enum
+import enum
+
+
+class AdAccountStatus(enum.StrEnum):
+    CONNECTED = "connected"
+    DISCONNECTED = "disconnected"
+    ERROR = "error"
 
 
 class AdAccount(Base):
     __tablename__ = "ad_accounts"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
-    platform = Column(String(50), nullable=False)  # "meta" or "google"
+    platform = Column(checked_enum(Platform, "ck_ad_accounts_platform"), nullable=False)
     account_id = Column(String(255), nullable=False)  # Platform-specific account ID
     account_name = Column(String(255))
-    access_token = Column(Text)  # Encrypted in production
-    refresh_token = Column(Text)  # Encrypted in production
+    access_token = Column(EncryptedToken)
+    refresh_token = Column(EncryptedToken)
     token_expires_at = Column(DateTime)
-    status = Column(String(50), default="connected")  # connected, disconnected, error
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    status = Column(checked_enum(AdAccountStatus, "ck_ad_accounts_status"), default=AdAccountStatus.CONNECTED)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, server_onupdate=UPDATED_BY_TRIGGER)
+
+    __table_args__ = (
+        UniqueConstraint("client_id", "platform", "account_id", name="uq_ad_accounts_client_platform_account"),
+        Index("ix_ad_accounts_client_status", "client_id", "status"),
+        Index(
+            "ix_ad_accounts_connected", "client_id", "platform",
+            postgresql_where=text("status = 'connected'"),
+        ),
+    )
 
     # Relationships
     client = relationship("Client", back_populates="ad_accounts")
@@ -1,31 +1,40 @@
 """Ad Set model - represents ad sets within campaigns."""
 
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.types import uuid7, UTC_NOW, UPDATED_BY_TRIGGER, checked_enum
+from app.models.ad import AdStatus
 
 
 class AdSet(Base):
     __tablename__ = "ad_sets"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     campaign_id = Column(UUID(as_uuid=True), ForeignKey("campaigns.id"), nullable=False, index=True)
     platform_adset_id = Column(String(255))
     name = Column(String(255), nullable=False)
     targeting_type = Column(String(100))  # broad, interest, lookalike, retargeting
-    status = Column(String(50), default="draft")
+    status = Column(checked_enum(AdStatus, "ck_ad_sets_status"), default=AdStatus.DRAFT)
     daily_budget = Column(Float, default=0.0)
     bid_strategy = Column(String(100))
-    targeting_spec = Column(JSON)  # Platform-specific targeting JSON
+    targeting_spec = Column(JSONB)  # Platform-specific targeting JSON
     age_min = Column(String(10))
     age_max = Column(String(10))
     genders = Column(String(50))
-    placements = Column(JSON)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    placements = Column(JSONB)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, server_onupdate=UPDATED_BY_TRIGGER)
+
+    __table_args__ = (
+        # Serves containment lookups such as targeting_spec @> '{"interests": [...]}'
+        Index(
+            "ix_ad_sets_targeting_spec", "targeting_spec",
+            postgresql_using="gin",
+            postgresql_ops={"targeting_spec": "jsonb_path_ops"},
+        ),
+    )
 
     # Relationships
     campaign = relationship("Campaign", back_populates="ad_sets")
@@ -1,28 +1,31 @@
 """Audience model - stores targeting audiences for campaigns."""
 
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.types import uuid7, UTC_NOW, UPDATED_BY_TRIGGER, Platform, checked_enum
 
 
 class Audience(Base):
     __tablename__ = "audiences"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
-    platform = Column(String(50), nullable=False)  # "meta" or "google"
+    platform = Column(checked_enum(Platform, "ck_audiences_platform"), nullable=False)
     audience_type = Column(String(100))  # custom, lookalike, interest, remarketing
     name = Column(String(255), nullable=False)
     platform_audience_id = Column(String(255))
     size = Column(Integer)
     description = Column(String(500))
-    spec = Column(JSON)  # Audience specification details
+    spec = Column(JSONB)  # Audience specification details
     status = Column(String(50), default="active")
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, server_onupdate=UPDATED_BY_TRIGGER)
+
+    __table_args__ = (
+        Index("ix_audiences_spec", "spec", postgresql_using="gin", postgresql_ops={"spec": "jsonb_path_ops"}),
+    )
 
     # Relationships
     client = relationship("Client", back_populates="audiences")
@@ -1,17 +1,16 @@
 """Budget Settings model - stores budget allocation configuration per client."""
 
-import uuid
-from datetime import datetime
 from sqlalchemy import Column, Float, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.types import uuid7, UTC_NOW, UPDATED_BY_TRIGGER
 
 
 class BudgetSettings(Base):
     __tablename__ = "budget_settings"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, unique=True)
 
     # Monthly Budget
@@ -26,9 +25,10 @@ class BudgetSettings(Base):
     # Safety thresholds
     daily_spend_alert_pct = Column(Float, default=0.10)  # Alert if daily > 10% of monthly
     monthly_spend_alert_pct = Column(Float, default=0.90)  # Alert at 90% of cap
+    last_alerted_threshold_pct = Column(Float, default=0.0)  # Cap alert already sent this month
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, server_onupdate=UPDATED_BY_TRIGGER)
 
     # Relationships
     client = relationship("Client", back_populates="budget_settings")
@@ -1,31 +1,43 @@
 """Campaign model - represents ad campaigns on Meta/Google."""
 
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.types import uuid7, UTC_NOW, UPDATED_BY_TRIGGER, Platform, checked_enum
+import enum
+
+
+class CampaignStatus(enum.StrEnum):
+    DRAFT = "draft"
+    ACTIVE = "active"
+    PAUSED = "paused"
+    COMPLETED = "completed"
+    ERROR = "error"
 
 
 class Campaign(Base):
     __tablename__ = "campaigns"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
     ad_account_id = Column(UUID(as_uuid=True), ForeignKey("ad_accounts.id"), nullable=False)
     platform_campaign_id = Column(String(255))  # ID from Meta/Google
     name = Column(String(255), nullable=False)
-    platform = Column(String(50), nullable=False)  # "meta" or "google"
+    platform = Column(checked_enum(Platform, "ck_campaigns_platform"), nullable=False)
     objective = Column(String(100))  # e.g., "SALES", "CONVERSIONS"
     campaign_type = Column(String(100))  # prospecting, retargeting, scaling, testing
-    status = Column(String(50), default="draft")  # draft, active, paused, completed, error
+    status = Column(checked_enum(CampaignStatus, "ck_campaigns_status"), default=CampaignStatus.DRAFT)
     daily_budget = Column(Float, default=0.0)
     lifetime_budget = Column(Float)
     start_date = Column(DateTime)
     end_date = Column(DateTime)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, server_onupdate=UPDATED_BY_TRIGGER)
+
+    __table_args__ = (
+        Index("ix_campaigns_client_status_platform", "client_id", "status", "platform"),
+    )
 
     # Relationships
     client = relationship("Client", back_populates="campaigns")
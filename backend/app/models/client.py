@@ -1,11 +1,10 @@
 """Client model - represents a business/brand using the platform."""
 
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Float, Boolean, DateTime, ForeignKey, Enum as SAEnum
+from sqlalchemy import Column, String, Float, Boolean, DateTime, ForeignKey, Index, Enum as SAEnum, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.types import uuid7, UTC_NOW, UPDATED_BY_TRIGGER
 import enum
 
 
@@ -20,7 +19,7 @@ class AutomationStatus(str, enum.Enum):
 class Client(Base):
     __tablename__ = "clients"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     company_name = Column(String(255), nullable=False)
     website = Column(String(500))
@@ -41,16 +40,26 @@ class Client(Base):
     google_developer_token = Column(String(200), nullable=True)
     ga4_property_id = Column(String(100), nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, server_onupdate=UPDATED_BY_TRIGGER)
 
-    # Relationships
+    __table_args__ = (
+        # Scheduled jobs select active clients' ids by automation status, index-only
+        Index(
+            "ix_clients_active_automation_status", "automation_status",
+            postgresql_where=text("is_active"),
+            postgresql_include=["id"],
+        ),
+    )
+
+    # Relationships: collections are never lazy-loaded (async sessions cannot);
+    # query them directly or opt in with selectinload()
     user = relationship("User", back_populates="clients")
-    ad_accounts = relationship("AdAccount", back_populates="client", cascade="all, delete-orphan")
-    campaigns = relationship("Campaign", back_populates="client", cascade="all, delete-orphan")
-    creatives = relationship("Creative", back_populates="client", cascade="all, delete-orphan")
-    audiences = relationship("Audience", back_populates="client", cascade="all, delete-orphan")
-    products = relationship("Product", back_populates="client", cascade="all, delete-orphan")
-    daily_metrics = relationship("DailyMetrics", back_populates="client", cascade="all, delete-orphan")
-    budget_settings = relationship("BudgetSettings", back_populates="client", uselist=False, cascade="all, delete-orphan")
-    optimization_logs = relationship("OptimizationLog", back_populates="client", cascade="all, delete-orphan")
+    ad_accounts = relationship("AdAccount", back_populates="client", cascade="all, delete-orphan", lazy="raise")
+    campaigns = relationship("Campaign", back_populates="client", cascade="all, delete-orphan", lazy="raise")
+    creatives = relationship("Creative", back_populates="client", cascade="all, delete-orphan", lazy="raise")
+    audiences = relationship("Audience", back_populates="client", cascade="all, delete-orphan", lazy="raise")
+    products = relationship("Product", back_populates="client", cascade="all, delete-orphan", lazy="raise")
+    daily_metrics = relationship("DailyMetrics", back_populates="client", cascade="all, delete-orphan", lazy="raise")
+    budget_settings = relationship("BudgetSettings", back_populates="client", uselist=False, cascade="all, delete-orphan", lazy="raise")
+    optimization_logs = relationship("OptimizationLog", back_populates="client", cascade="all, delete-orphan", lazy="raise")
@@ -1,17 +1,23 @@
 """Creative model - stores ad creative assets."""
 
-import uuid
-from datetime import datetime
 from sqlalchemy import Column, String, Text, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.types import uuid7, UTC_NOW, UPDATED_BY_TRIGGER, checked_enum
+import enum
+
+
+class CreativeStatus(enum.StrEnum):
+    ACTIVE = "active"
+    FATIGUED = "fatigued"
+    ARCHIVED = "archived"
 
 
 class Creative(Base):
     __tablename__ = "creatives"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     creative_type = Column(String(50))  # image, video, carousel
@@ -21,9 +27,9 @@ class Creative(Base):
     body = Column(Text)
     cta = Column(String(100))  # e.g., "SHOP_NOW", "LEARN_MORE"
     platform_creative_id = Column(String(255))
-    status = Column(String(50), default="active")  # active, fatigued, archived
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    status = Column(checked_enum(CreativeStatus, "ck_creatives_status"), default=CreativeStatus.ACTIVE)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, server_onupdate=UPDATED_BY_TRIGGER)
 
     # Relationships
     client = relationship("Client", back_populates="creatives")
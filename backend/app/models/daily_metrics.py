@@ -1,36 +1,38 @@
 """Daily Metrics model - stores daily performance data per campaign."""
 
-import uuid
-from datetime import datetime, date
-from sqlalchemy import Column, String, Float, Integer, Date, DateTime, ForeignKey, UniqueConstraint
+from datetime import date
+from sqlalchemy import Column, Float, Integer, Date, DateTime, ForeignKey, UniqueConstraint, Index, Computed
+from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.types import uuid7, Platform, checked_enum
 
 
 class DailyMetrics(Base):
     __tablename__ = "daily_metrics"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
-    campaign_id = Column(UUID(as_uuid=True), ForeignKey("campaigns.id"), index=True)
-    platform = Column(String(50))  # meta, google, ga4
-    date = Column(Date, nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
+    campaign_id = Column(UUID(as_uuid=True), ForeignKey("campaigns.id"))
+    platform = Column(checked_enum(Platform, "ck_daily_metrics_platform"))
+    date = Column(Date, nullable=False)
 
     # Performance Metrics
     spend = Column(Float, default=0.0)
     impressions = Column(Integer, default=0)
     clicks = Column(Integer, default=0)
-    ctr = Column(Float, default=0.0)  # Click-through rate
-    cpc = Column(Float, default=0.0)  # Cost per click
-    cpm = Column(Float, default=0.0)  # Cost per mille
+    # Ratios are generated by Postgres from the raw counters on write
+    ctr = Column(Float, Computed("CASE WHEN impressions > 0 THEN clicks::float8 / impressions ELSE 0 END", persisted=True))  # Click-through rate
+    cpc = Column(Float, Computed("CASE WHEN clicks > 0 THEN spend / clicks ELSE 0 END", persisted=True))  # Cost per click
+    cpm = Column(Float, Computed("CASE WHEN impressions > 0 THEN spend * 1000 / impressions ELSE 0 END", persisted=True))  # Cost per mille
 
     # Conversion Metrics
     conversions = Column(Integer, default=0)
     conversion_value = Column(Float, default=0.0)
     revenue = Column(Float, default=0.0)
-    roas = Column(Float, default=0.0)  # Return on ad spend
-    cpa = Column(Float, default=0.0)  # Cost per acquisition
+    roas = Column(Float, Computed("CASE WHEN spend > 0 THEN revenue / spend ELSE 0 END", persisted=True))  # Return on ad spend
+    cpa = Column(Float, Computed("CASE WHEN conversions > 0 THEN spend / conversions ELSE 0 END", persisted=True))  # Cost per acquisition
 
     # Engagement
     frequency = Column(Float, default=0.0)
@@ -40,10 +42,16 @@ class DailyMetrics(Base):
     sessions = Column(Integer, default=0)
     bounce_rate = Column(Float)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     __table_args__ = (
         UniqueConstraint("client_id", "campaign_id", "platform", "date", name="uq_daily_metrics"),
+        # Covers the dashboard aggregations with an index-only scan
+        Index(
+            "ix_daily_metrics_client_date", "client_id", "date",
+            postgresql_include=["spend", "revenue", "conversions", "roas", "clicks", "impressions"],
+        ),
+        Index("ix_daily_metrics_campaign_date", "campaign_id", "date"),
     )
 
     # Relationships
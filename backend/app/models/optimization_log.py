@@ -1,18 +1,25 @@
 """Optimization Log model - tracks all automated actions taken."""
 
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Float, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Float, Text, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.types import uuid7, checked_enum
+import enum
+
+
+class OptimizationStatus(enum.StrEnum):
+    COMPLETED = "completed"
+    FAILED = "failed"
+    PENDING = "pending"
 
 
 class OptimizationLog(Base):
     __tablename__ = "optimization_logs"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
     campaign_id = Column(UUID(as_uuid=True), ForeignKey("campaigns.id"), index=True)
 
     action = Column(String(100), nullable=False)  # budget_increase, budget_decrease, pause, duplicate, etc.
@@ -21,10 +28,14 @@ class OptimizationLog(Base):
     entity_id = Column(String(255))  # Platform entity ID
     old_value = Column(String(255))
     new_value = Column(String(255))
-    status = Column(String(50), default="completed")  # completed, failed, pending
+    status = Column(checked_enum(OptimizationStatus, "ck_optimization_logs_status"), default=OptimizationStatus.COMPLETED)
     error_message = Column(Text)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_optimization_logs_client_created", "client_id", "created_at"),
+    )
 
     # Relationships
     client = relationship("Client", back_populates="optimization_logs")
@@ -0,0 +1,100 @@
+"""Custom SQLAlchemy column types."""
+
+import base64
+import enum
+import os
+import time
+import uuid
+from functools import lru_cache
+from typing import Optional
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from sqlalchemy import Enum as SAEnum, Text, func
+from sqlalchemy.schema import FetchedValue
+from sqlalchemy.types import TypeDecorator
+
+from app.config import settings
+
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUIDv7 (RFC 9562).
+
+    The leading 48 bits are the Unix timestamp in milliseconds, so new primary
+    keys append to the right edge of the btree instead of landing on random
+    pages, and ``ORDER BY id`` roughly follows insertion order.
+    """
+    value = (time.time_ns() // 1_000_000) << 80
+    value |= int.from_bytes(os.urandom(10), "big") & ((1 << 80) - 1)
+    value &= ~(0xF << 76)
+    value |= 0x7 << 76  # version
+    value &= ~(0x3 << 62)
+    value |= 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+# Timestamps are stamped by Postgres as naive UTC, matching the existing data;
+# updated_at is maintained by the set_updated_at trigger (see migrations).
+UTC_NOW = func.timezone("utc", func.now())
+UPDATED_BY_TRIGGER = FetchedValue()
+
+
+class Platform(enum.StrEnum):
+    META = "meta"
+    GOOGLE = "google"
+    GA4 = "ga4"
+
+
+def checked_enum(enum_cls: type[enum.Enum], name: str) -> SAEnum:
+    """VARCHAR column restricted to an enum's values by a CHECK constraint.
+
+    Values (not member names) are stored, so existing lowercase rows and plain
+    string comparisons keep working. Loaded attributes are enum members, so
+    enums used here should be StrEnums, which print and format as their value.
+    """
+    return SAEnum(
+        enum_cls,
+        name=name,
+        native_enum=False,
+        create_constraint=True,
+        length=50,
+        values_callable=lambda members: [m.value for m in members],
+    )
+
+
+_PREFIX = "enc:v1:"
+_NONCE_BYTES = 12
+
+
+@lru_cache(maxsize=1)
+def _cipher() -> Optional[AESGCM]:
+    if not settings.TOKEN_ENCRYPTION_KEY:
+        return None
+    return AESGCM(base64.urlsafe_b64decode(settings.TOKEN_ENCRYPTION_KEY))
+
+
+class EncryptedToken(TypeDecorator):
+    """Text column encrypted with AES-GCM (hardware AES via OpenSSL).
+
+    Values are stored as ``enc:v1:<base64(nonce + ciphertext)>``. Rows written
+    before encryption was enabled are returned unchanged, and without a
+    configured key values pass through as plain text.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        cipher = _cipher()
+        if value is None or cipher is None:
+            return value
+        nonce = os.urandom(_NONCE_BYTES)
+        sealed = nonce + cipher.encrypt(nonce, value.encode(), None)
+        return _PREFIX + base64.urlsafe_b64encode(sealed).decode()
+
+    def process_result_value(self, value, dialect):
+        if value is None or not value.startswith(_PREFIX):
+            return value
+        cipher = _cipher()
+        if cipher is None:
+            raise ValueError("TOKEN_ENCRYPTION_KEY is required to read encrypted tokens")
+        sealed = base64.urlsafe_b64decode(value[len(_PREFIX):])
+        return cipher.decrypt(sealed[:_NONCE_BYTES], sealed[_NONCE_BYTES:], None).decode()
@@ -1,12 +1,14 @@
 """Ad Account schemas."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
 
+from app.schemas.base import ResponseModel
 
-class AdAccountResponse(BaseModel):
+
+class AdAccountResponse(ResponseModel):
     id: UUID
     client_id: UUID
     platform: str
@@ -15,11 +17,10 @@ class AdAccountResponse(BaseModel):
     status: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class OAuthURLResponse(BaseModel):
+class OAuthURLResponse(ResponseModel):
     auth_url: str
 
 
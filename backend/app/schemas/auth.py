@@ -1,9 +1,11 @@
 """Authentication schemas."""
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from uuid import UUID
 from datetime import datetime
 
+from app.schemas.base import ResponseModel
+
 
 class UserRegister(BaseModel):
     email: EmailStr
@@ -16,12 +18,12 @@ class UserLogin(BaseModel):
     password: str
 
 
-class TokenResponse(BaseModel):
+class TokenResponse(ResponseModel):
     access_token: str
     token_type: str = "bearer"
 
 
-class UserResponse(BaseModel):
+class UserResponse(ResponseModel):
     id: UUID
     email: str
     full_name: str
@@ -29,5 +31,4 @@ class UserResponse(BaseModel):
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,9 @@
+"""Shared schema base classes."""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ResponseModel(BaseModel):
+    """Base for outbound schemas: built once per response and never mutated."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
@@ -1,12 +1,14 @@
 """Campaign schemas."""
 
-from pydantic import BaseModel
+from pydantic import ConfigDict
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, List
 
+from app.schemas.base import ResponseModel
 
-class CampaignResponse(BaseModel):
+
+class CampaignResponse(ResponseModel):
     id: UUID
     client_id: UUID
     name: str
@@ -18,16 +20,15 @@ class CampaignResponse(BaseModel):
     platform_campaign_id: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class CampaignListResponse(BaseModel):
+class CampaignListResponse(ResponseModel):
     campaigns: List[CampaignResponse]
     total: int
 
 
-class OptimizationLogResponse(BaseModel):
+class OptimizationLogResponse(ResponseModel):
     id: UUID
     client_id: UUID
     campaign_id: Optional[UUID]
@@ -39,5 +40,4 @@ class OptimizationLogResponse(BaseModel):
     status: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
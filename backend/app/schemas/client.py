@@ -1,10 +1,12 @@
 """Client schemas."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
 
+from app.schemas.base import ResponseModel
+
 
 class ClientCreate(BaseModel):
     company_name: str
@@ -31,7 +33,7 @@ class ClientUpdate(BaseModel):
     ga4_property_id: Optional[str] = None
 
 
-class ClientResponse(BaseModel):
+class ClientResponse(ResponseModel):
     id: UUID
     user_id: UUID
     company_name: str
@@ -51,8 +53,7 @@ class ClientResponse(BaseModel):
     ga4_property_id: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BudgetSettingsUpdate(BaseModel):
@@ -62,7 +63,7 @@ class BudgetSettingsUpdate(BaseModel):
     testing_pct: Optional[float] = None
 
 
-class BudgetSettingsResponse(BaseModel):
+class BudgetSettingsResponse(ResponseModel):
     id: UUID
     client_id: UUID
     monthly_cap: float
@@ -71,5 +72,4 @@ class BudgetSettingsResponse(BaseModel):
     retargeting_pct: float
     testing_pct: float
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
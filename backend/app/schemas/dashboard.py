@@ -1,11 +1,12 @@
 """Dashboard schemas."""
 
-from pydantic import BaseModel
 from typing import List, Optional
 from datetime import date
 
+from app.schemas.base import ResponseModel
 
-class MetricsSummary(BaseModel):
+
+class MetricsSummary(ResponseModel):
     total_spend: float = 0.0
     total_revenue: float = 0.0
     total_conversions: int = 0
@@ -16,7 +17,7 @@ class MetricsSummary(BaseModel):
     monthly_budget: float = 0.0
 
 
-class DailyMetricPoint(BaseModel):
+class DailyMetricPoint(ResponseModel):
     date: date
     spend: float = 0.0
     revenue: float = 0.0
@@ -27,12 +28,12 @@ class DailyMetricPoint(BaseModel):
     impressions: int = 0
 
 
-class DailyMetricsResponse(BaseModel):
+class DailyMetricsResponse(ResponseModel):
     data: List[DailyMetricPoint]
     period_days: int
 
 
-class TopCampaign(BaseModel):
+class TopCampaign(ResponseModel):
     campaign_id: str
     name: str
     platform: str
@@ -43,7 +44,7 @@ class TopCampaign(BaseModel):
     status: str
 
 
-class DashboardOverview(BaseModel):
+class DashboardOverview(ResponseModel):
     summary: MetricsSummary
     daily_metrics: List[DailyMetricPoint]
     top_campaigns: List[TopCampaign]
@@ -0,0 +1,27 @@
+"""Webhook payload schemas.
+
+These are msgspec Structs rather than Pydantic models so the raw body is
+decoded and validated in a single pass.
+"""
+
+from typing import Any
+import msgspec
+
+
+class MetaChange(msgspec.Struct, frozen=True):
+    field: str
+    value: dict[str, Any] = {}
+
+
+class MetaEntry(msgspec.Struct, frozen=True):
+    id: str
+    time: int = 0
+    changes: list[MetaChange] = []
+
+
+class MetaWebhookEvent(msgspec.Struct, frozen=True):
+    object: str
+    entry: list[MetaEntry] = []
+
+
+meta_event_decoder = msgspec.json.Decoder(MetaWebhookEvent)
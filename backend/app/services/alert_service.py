@@ -1,12 +1,137 @@
 """Alert Service - sends notifications via Email and Slack."""
 
+import asyncio
 import logging
-import httpx
-from typing import Optional
+import orjson
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import NamedTuple, Optional
 from app.config import settings
+from app.utils.http import get_http_client
+
+try:
+    import aiosmtplib
+except ImportError:  # optional: email alerts are skipped without it
+    aiosmtplib = None
 
 logger = logging.getLogger(__name__)
 
+_LEVEL_EMOJI = {"info": "ℹ️", "warning": "⚠️", "critical": "🚨"}
+_LEVEL_COLOR = {"info": "#36a64f", "warning": "#ff9900", "critical": "#ff0000"}
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_EMAIL_SECTION = """
+            <h2 style="color: {color};">{title}</h2>
+            <p>{message}</p>"""
+_EMAIL_BODY = """
+        <html>
+        <body style="font-family: Arial, sans-serif; padding: 20px;">{sections}
+            <hr>
+            <p style="color: #888; font-size: 12px;">
+                FAGE Automation Engine | {level} Alert
+            </p>
+        </body>
+        </html>
+        """
+
+# One SMTP session shared by all AlertService instances; a socket carries one
+# conversation at a time, so sends are serialized by the lock
+SMTP_MAX_CONNECTION_AGE = 100  # seconds; servers drop idle sessions anyway
+_smtp = None
+_smtp_opened_at = 0.0
+_smtp_lock = asyncio.Lock()
+
+# Alerts raised within this window are sent as one Slack message / email digest
+ALERT_BATCH_WINDOW = 0.25  # seconds
+ALERT_BATCH_MAX = 20
+_alert_queue: Optional[asyncio.Queue] = None
+_dispatcher_task: Optional[asyncio.Task] = None
+_STOP_DISPATCHER = object()  # Queued by stop_alert_dispatcher to end the dispatch loop
+
+
+async def _smtp_connection():
+    """Return a live SMTP session, reconnecting when missing or too old."""
+    global _smtp, _smtp_opened_at
+    if _smtp is not None and (
+        not _smtp.is_connected or time.monotonic() - _smtp_opened_at > SMTP_MAX_CONNECTION_AGE
+    ):
+        await close_smtp()
+    if _smtp is None:
+        smtp = aiosmtplib.SMTP(hostname=settings.SMTP_HOST, port=settings.SMTP_PORT, use_tls=True)
+        await smtp.connect()
+        if settings.SMTP_USER:
+            await smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        _smtp, _smtp_opened_at = smtp, time.monotonic()
+    return _smtp
+
+
+class Alert(NamedTuple):
+    title: str
+    message: str
+    level: str
+
+
+async def _dispatch_alerts():
+    """Drain the queue in micro-batches: wait for one alert, then collect the rest of the window.
+
+    Returns after delivering its current batch once the stop sentinel is reached.
+    """
+    service = AlertService()
+    stopping = False
+    while not stopping:
+        first = await _alert_queue.get()
+        if first is _STOP_DISPATCHER:
+            return
+        batch = [first]
+        await asyncio.sleep(ALERT_BATCH_WINDOW)
+        while len(batch) < ALERT_BATCH_MAX and not _alert_queue.empty():
+            alert = _alert_queue.get_nowait()
+            if alert is _STOP_DISPATCHER:
+                stopping = True
+                break
+            batch.append(alert)
+        await service.deliver(batch)
+
+
+def start_alert_dispatcher():
+    """Start batching alerts in the background; called on application startup."""
+    global _alert_queue, _dispatcher_task
+    _alert_queue = asyncio.Queue()
+    _dispatcher_task = asyncio.create_task(_dispatch_alerts())
+
+
+async def stop_alert_dispatcher():
+    """Stop the dispatcher and send anything still queued."""
+    global _alert_queue, _dispatcher_task
+    if _dispatcher_task is None:
+        return
+    # Let the dispatcher finish the batch it holds instead of cancelling it mid-send
+    _alert_queue.put_nowait(_STOP_DISPATCHER)
+    try:
+        await _dispatcher_task
+    except Exception as e:
+        logger.error(f"Alert dispatcher failed: {e}")
+    # Alerts queued behind the sentinel
+    pending = []
+    while not _alert_queue.empty():
+        pending.append(_alert_queue.get_nowait())
+    _alert_queue, _dispatcher_task = None, None
+    if pending:
+        await AlertService().deliver(pending)
+
+
+async def close_smtp():
+    """Close the shared SMTP session; called on application shutdown."""
+    global _smtp
+    if _smtp is None:
+        return
+    smtp, _smtp = _smtp, None
+    try:
+        await smtp.quit()
+    except Exception:
+        smtp.close()
+
 
 class AlertService:
     """Sends alerts via email (SMTP) and Slack webhook."""
@@ -14,80 +139,78 @@ class AlertService:
     async def send_alert(
         self, title: str, message: str, level: str = "info"
     ):
-        """Send alert via all configured channels."""
-        full_message = f"**{title}**\n\n{message}\n\nLevel: {level}"
+        """Queue an alert for the batching dispatcher, or send it now if none is running."""
         logger.info(f"Alert [{level}]: {title}")
-
-        # Send via Slack
+        alert = Alert(title, message, level)
+        if _alert_queue is not None:
+            _alert_queue.put_nowait(alert)
+        else:
+            await self.deliver([alert])
+
+    async def deliver(self, alerts: list[Alert]):
+        """Send a batch of alerts via all configured channels concurrently."""
+        channels = []
         if settings.SLACK_WEBHOOK_URL:
-            try:
-                await self._send_slack(title, message, level)
-            except Exception as e:
-                logger.error(f"Slack alert failed: {e}")
-
-        # Send via Email
-        if settings.SMTP_HOST and settings.ALERT_TO_EMAILS:
-            try:
-                await self._send_email(title, message, level)
-            except Exception as e:
-                logger.error(f"Email alert failed: {e}")
-
-    async def _send_slack(self, title: str, message: str, level: str):
-        """Send alert to Slack via webhook."""
-        emoji = {"info": "ℹ️", "warning": "⚠️", "critical": "🚨"}.get(level, "📢")
-        color = {"info": "#36a64f", "warning": "#ff9900", "critical": "#ff0000"}.get(level, "#cccccc")
-
-        payload = {
-            "attachments": [{
-                "color": color,
-                "title": f"{emoji} {title}",
+            channels.append(("Slack", self._send_slack(alerts)))
+        if settings.SMTP_HOST and settings.alert_recipients_list:
+            channels.append(("Email", self._send_email(alerts)))
+
+        results = await asyncio.gather(*(send for _, send in channels), return_exceptions=True)
+        for (name, _), result in zip(channels, results):
+            if isinstance(result, Exception):
+                logger.error(f"{name} alert failed: {result}")
+
+    async def _send_slack(self, alerts: list[Alert]):
+        """Send alerts to Slack via webhook, one attachment per alert."""
+        attachments = []
+        for title, message, level in alerts:
+            attachments.append({
+                "color": _LEVEL_COLOR.get(level, "#cccccc"),
+                "title": f"{_LEVEL_EMOJI.get(level, '📢')} {title}",
                 "text": message,
                 "footer": "FAGE Automation Engine",
-            }]
-        }
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(settings.SLACK_WEBHOOK_URL, json=payload)
-            response.raise_for_status()
-
-    async def _send_email(self, title: str, message: str, level: str):
-        """Send alert email via SMTP."""
-        try:
-            import aiosmtplib
-            from email.mime.text import MIMEText
-            from email.mime.multipart import MIMEMultipart
-
-            recipients = [e.strip() for e in settings.ALERT_TO_EMAILS.split(",") if e.strip()]
-            if not recipients:
-                return
-
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = f"[FAGE {level.upper()}] {title}"
-            msg["From"] = settings.ALERT_FROM_EMAIL
-            msg["To"] = ", ".join(recipients)
-
-            html_body = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; padding: 20px;">
-                <h2 style="color: {'#ff0000' if level == 'critical' else '#333'};">{title}</h2>
-                <p>{message}</p>
-                <hr>
-                <p style="color: #888; font-size: 12px;">
-                    FAGE Automation Engine | {level.upper()} Alert
-                </p>
-            </body>
-            </html>
-            """
-            msg.attach(MIMEText(html_body, "html"))
-
-            await aiosmtplib.send(
-                msg,
-                hostname=settings.SMTP_HOST,
-                port=settings.SMTP_PORT,
-                username=settings.SMTP_USER,
-                password=settings.SMTP_PASSWORD,
-                use_tls=True,
+            })
+
+        response = await get_http_client().post(
+            settings.SLACK_WEBHOOK_URL,
+            content=orjson.dumps({"attachments": attachments}),
+            headers=_JSON_HEADERS,
+        )
+        response.raise_for_status()
+
+    async def _send_email(self, alerts: list[Alert]):
+        """Send alerts as a single email via SMTP."""
+        if aiosmtplib is None:
+            logger.warning("aiosmtplib not installed, skipping email alert")
+            return
+
+        recipients = settings.alert_recipients_list
+        if not recipients:
+            return
+
+        level = "critical" if any(a.level == "critical" for a in alerts) else alerts[0].level
+        subject = alerts[0].title if len(alerts) == 1 else f"{len(alerts)} alerts"
+
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = f"[FAGE {level.upper()}] {subject}"
+        msg["From"] = settings.ALERT_FROM_EMAIL
+        msg["To"] = ", ".join(recipients)
+
+        sections = "".join(
+            _EMAIL_SECTION.format(
+                color="#ff0000" if a.level == "critical" else "#333", title=a.title, message=a.message,
             )
+            for a in alerts
+        )
+        html_body = _EMAIL_BODY.format(sections=sections, level=level.upper())
+        msg.attach(MIMEText(html_body, "html"))
 
-        except ImportError:
-            logger.warning("aiosmtplib not installed, skipping email alert")
+        async with _smtp_lock:
+            try:
+                smtp = await _smtp_connection()
+                await smtp.send_message(msg)
+            except aiosmtplib.SMTPServerDisconnected:
+                # The server closed the idle session; reconnect and retry once
+                await close_smtp()
+                smtp = await _smtp_connection()
+                await smtp.send_message(msg)
@@ -1,5 +1,7 @@
 """Authentication service - business logic for user management."""
 
+import asyncio
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.user import User
@@ -17,17 +19,18 @@ class AuthService:
         return result.scalar_one_or_none()
 
     async def create_user(self, email: str, password: str, full_name: str) -> User:
+        # bcrypt is deliberately slow CPU work; keep it off the event loop
         user = User(
             email=email,
-            hashed_password=hash_password(password),
+            hashed_password=await asyncio.to_thread(hash_password, password),
             full_name=full_name,
         )
         self.db.add(user)
         await self.db.flush()
         return user
 
-    def authenticate(self, user: User, password: str) -> bool:
-        return verify_password(password, user.hashed_password)
+    async def authenticate(self, user: User, password: str) -> bool:
+        return await asyncio.to_thread(verify_password, password, user.hashed_password)
 
     @staticmethod
     def generate_token(user_id: str) -> str:
@@ -1,9 +1,11 @@
 """Budget Manager - enforces caps, detects anomalies, tracks spend."""
 
+import asyncio
 import logging
 from datetime import date, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy import select, func
+from sqlalchemy import select, func, case
+from sqlalchemy.orm import joinedload
 
 from app.models.client import Client, AutomationStatus
 from app.models.daily_metrics import DailyMetrics
@@ -12,9 +14,13 @@ from app.models.campaign import Campaign
 from app.services.meta_ads import MetaAdsService
 from app.services.google_ads import GoogleAdsService
 from app.services.alert_service import AlertService
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Concurrent platform API calls when pausing a client's campaigns
+PLATFORM_CALL_CONCURRENCY = 8
+
 
 class BudgetManager:
     """Monitors and enforces budget safety across all clients."""
@@ -25,100 +31,128 @@ class BudgetManager:
 
     async def check_all_budgets(self):
         """Run budget safety checks for all active clients."""
+        active_clients = select(Client.id).where(
+            Client.automation_status == AutomationStatus.ACTIVE,
+            Client.is_active == True,
+        )
+
+        # Every client's budget and spend figures arrive in one query; only
+        # clients over their cap need further per-client work
         async with self.session_factory() as db:
-            result = await db.execute(
-                select(Client).where(
-                    Client.automation_status == AutomationStatus.ACTIVE,
-                    Client.is_active == True,
-                )
-            )
-            clients = result.scalars().all()
+            result = await db.execute(self._budgets_with_spend(active_clients))
+            over_cap = [
+                (row.BudgetSettings.client_id, row.BudgetSettings.monthly_cap)
+                for row in result.all()
+                if await self._evaluate_budget(row)
+            ]
+            await db.commit()
 
-        for client in clients:
-            try:
-                await self.check_client_budget(client.id)
-            except Exception as e:
-                logger.error(f"Budget check failed for client {client.id}: {e}")
+        # Clients are independent; bound concurrency to stay within the DB pool
+        semaphore = asyncio.Semaphore(settings.SCHEDULER_CLIENT_CONCURRENCY)
+
+        async def pause(client_id, monthly_cap):
+            async with semaphore:
+                try:
+                    await self._pause_over_cap_client(client_id, monthly_cap)
+                except Exception as e:
+                    logger.error(f"Budget check failed for client {client_id}: {e}")
+
+        await asyncio.gather(*(pause(*item) for item in over_cap))
 
     async def check_client_budget(self, client_id):
         """Run all budget safety checks for a client."""
         async with self.session_factory() as db:
-            # Get budget settings
-            result = await db.execute(
-                select(BudgetSettings).where(BudgetSettings.client_id == client_id)
-            )
-            budget = result.scalar_one_or_none()
-            if not budget or budget.monthly_cap <= 0:
+            result = await db.execute(self._budgets_with_spend([client_id]))
+            row = result.one_or_none()
+            if row is None:
                 return
-
-            # Calculate current month spend
-            first_of_month = date.today().replace(day=1)
-            spend_result = await db.execute(
-                select(func.coalesce(func.sum(DailyMetrics.spend), 0)).where(
-                    DailyMetrics.client_id == client_id,
-                    DailyMetrics.date >= first_of_month,
-                )
-            )
-            current_spend = float(spend_result.scalar())
-            budget.current_month_spend = current_spend
-
-            # Check 1: Monthly cap approaching
-            usage_pct = current_spend / budget.monthly_cap
-            if usage_pct >= budget.monthly_spend_alert_pct:
-                await self.alert_service.send_alert(
-                    title="⚠️ Budget Alert: Monthly Cap Approaching",
-                    message=(
-                        f"Client has spent ${current_spend:,.2f} of "
-                        f"${budget.monthly_cap:,.2f} monthly budget "
-                        f"({usage_pct*100:.1f}%)"
-                    ),
-                    level="warning",
-                )
-
-            # Check 2: Monthly cap exceeded → pause all campaigns
-            if current_spend >= budget.monthly_cap:
-                await self._pause_all_campaigns(db, client_id)
-                await self.alert_service.send_alert(
-                    title="🛑 Budget Cap Reached - Campaigns Paused",
-                    message=(
-                        f"Monthly budget of ${budget.monthly_cap:,.2f} exceeded. "
-                        f"All campaigns have been paused."
-                    ),
-                    level="critical",
-                )
-
-            # Check 3: Abnormal daily spend detection
-            await self._check_abnormal_spend(db, client_id, budget)
-
+            over_cap = await self._evaluate_budget(row)
             await db.commit()
 
-    async def _check_abnormal_spend(
-        self, db: AsyncSession, client_id, budget: BudgetSettings
-    ):
-        """Detect abnormally high daily spend."""
+        if over_cap:
+            await self._pause_over_cap_client(client_id, row.BudgetSettings.monthly_cap)
+
+    @staticmethod
+    def _budgets_with_spend(client_ids):
+        """Budget rows joined to month-to-date, yesterday and 7-day average spend per client."""
         today = date.today()
+        first_of_month = today.replace(day=1)
         yesterday = today - timedelta(days=1)
+        week_ago = today - timedelta(days=7)
 
-        # Yesterday's spend
-        result = await db.execute(
-            select(func.coalesce(func.sum(DailyMetrics.spend), 0)).where(
-                DailyMetrics.client_id == client_id,
-                DailyMetrics.date == yesterday,
+        # One grouped pass over recent rows computes all three figures
+        spend = DailyMetrics.spend
+        day = DailyMetrics.date
+        totals = (
+            select(
+                DailyMetrics.client_id,
+                func.sum(case((day >= first_of_month, spend))).label("month_spend"),
+                func.sum(case((day == yesterday, spend))).label("yesterday_spend"),
+                func.avg(case(((day >= week_ago) & (day < yesterday), spend))).label("avg_daily"),
+            )
+            .where(
+                DailyMetrics.client_id.in_(client_ids),
+                day >= min(first_of_month, week_ago),
+            )
+            .group_by(DailyMetrics.client_id)
+            .subquery()
+        )
+        return (
+            select(BudgetSettings, totals.c.month_spend, totals.c.yesterday_spend, totals.c.avg_daily)
+            .outerjoin(totals, totals.c.client_id == BudgetSettings.client_id)
+            .where(
+                BudgetSettings.client_id.in_(client_ids),
+                BudgetSettings.monthly_cap > 0,
             )
         )
-        yesterday_spend = float(result.scalar())
 
-        # Average daily spend over last 7 days
-        week_ago = today - timedelta(days=7)
-        avg_result = await db.execute(
-            select(func.coalesce(func.avg(DailyMetrics.spend), 0)).where(
-                DailyMetrics.client_id == client_id,
-                DailyMetrics.date >= week_ago,
-                DailyMetrics.date < yesterday,
+    async def _evaluate_budget(self, row) -> bool:
+        """Record month-to-date spend and raise alerts; return True when the cap is reached."""
+        budget = row.BudgetSettings
+        current_spend = float(row.month_spend or 0)
+        previous_spend = budget.current_month_spend
+        budget.current_month_spend = current_spend
+
+        # Check 1: Monthly cap approaching, alerted once per crossing rather than every poll
+        usage_pct = current_spend / budget.monthly_cap
+        if usage_pct < budget.monthly_spend_alert_pct:
+            budget.last_alerted_threshold_pct = 0.0
+        elif (budget.last_alerted_threshold_pct or 0) < budget.monthly_spend_alert_pct:
+            await self.alert_service.send_alert(
+                title="⚠️ Budget Alert: Monthly Cap Approaching",
+                message=(
+                    f"Client has spent ${current_spend:,.2f} of "
+                    f"${budget.monthly_cap:,.2f} monthly budget "
+                    f"({usage_pct*100:.1f}%)"
+                ),
+                level="warning",
             )
+            budget.last_alerted_threshold_pct = budget.monthly_spend_alert_pct
+
+        # Check 3: Abnormal daily spend detection; nothing new to see until spend moves
+        if current_spend != previous_spend:
+            await self._check_abnormal_spend(float(row.yesterday_spend or 0), float(row.avg_daily or 0))
+
+        # Check 2: Monthly cap exceeded → caller pauses all campaigns
+        return current_spend >= budget.monthly_cap
+
+    async def _pause_over_cap_client(self, client_id, monthly_cap: float):
+        """Pause a client that exceeded its monthly cap and raise the critical alert."""
+        async with self.session_factory() as db:
+            await self._pause_all_campaigns(db, client_id)
+            await db.commit()
+
+        await self.alert_service.send_alert(
+            title="🛑 Budget Cap Reached - Campaigns Paused",
+            message=(
+                f"Monthly budget of ${monthly_cap:,.2f} exceeded. "
+                f"All campaigns have been paused."
+            ),
+            level="critical",
         )
-        avg_daily = float(avg_result.scalar())
 
+    async def _check_abnormal_spend(self, yesterday_spend: float, avg_daily: float):
+        """Detect abnormally high daily spend."""
         # Alert if yesterday's spend is > 2x average
         if avg_daily > 0 and yesterday_spend > avg_daily * 2:
             await self.alert_service.send_alert(
@@ -140,45 +174,53 @@ class BudgetManager:
             return
 
         result = await db.execute(
-            select(Campaign).where(
+            select(Campaign)
+            .options(joinedload(Campaign.ad_account))
+            .where(
                 Campaign.client_id == client_id,
                 Campaign.status == "active",
             )
         )
         campaigns = result.scalars().all()
 
-        for campaign in campaigns:
-            try:
-                # Pause on platform
-                result = await db.execute(
-                    select(AdAccount).where(AdAccount.id == campaign.ad_account_id)
-                )
-                account = result.scalar_one_or_none()
-                
-                if account:
-                    if campaign.platform == "meta":
-                        meta = MetaAdsService(
-                            app_id=client_obj.meta_app_id,
-                            app_secret=client_obj.meta_app_secret
-                        )
-                        await meta.update_campaign_status(
-                            campaign.platform_campaign_id, account.access_token, "PAUSED"
-                        )
-                    elif campaign.platform == "google":
-                        google = GoogleAdsService(
-                            client_id=client_obj.google_client_id,
-                            client_secret=client_obj.google_client_secret,
-                            developer_token=client_obj.google_developer_token
-                        )
-                        await google.update_campaign_status(
-                            account.account_id, account.access_token,
-                            campaign.platform_campaign_id, "PAUSED"
-                        )
-                
-                campaign.status = "paused"
-                logger.warning(f"Paused campaign {campaign.name} on {campaign.platform} due to budget cap")
-            except Exception as e:
-                logger.error(f"Failed to pause campaign {campaign.name} on platform: {e}")
+        # One service per platform for the whole client
+        meta = MetaAdsService(
+            app_id=client_obj.meta_app_id,
+            app_secret=client_obj.meta_app_secret
+        )
+        google = GoogleAdsService(
+            client_id=client_obj.google_client_id,
+            client_secret=client_obj.google_client_secret,
+            developer_token=client_obj.google_developer_token
+        )
+
+        # Platform calls are independent per campaign; run a few at a time
+        semaphore = asyncio.Semaphore(PLATFORM_CALL_CONCURRENCY)
+
+        async def pause_on_platform(campaign: Campaign):
+            account = campaign.ad_account
+            if not account:
+                return
+            async with semaphore:
+                if campaign.platform == "meta":
+                    await meta.update_campaign_status(
+                        campaign.platform_campaign_id, account.access_token, "PAUSED"
+                    )
+                elif campaign.platform == "google":
+                    await google.update_campaign_status(
+                        account.account_id, account.access_token,
+                        campaign.platform_campaign_id, "PAUSED"
+                    )
+
+        results = await asyncio.gather(
+            *(pause_on_platform(campaign) for campaign in campaigns), return_exceptions=True
+        )
+        for campaign, result in zip(campaigns, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to pause campaign {campaign.name} on platform: {result}")
+                continue
+            campaign.status = "paused"
+            logger.warning(f"Paused campaign {campaign.name} on {campaign.platform} due to budget cap")
 
         # Update client status
         client_obj.automation_status = AutomationStatus.PAUSED
@@ -1,20 +1,55 @@
 """Campaign Creation Engine - automated campaign setup from strategy."""
 
+import asyncio
+import copy
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy import select
+from sqlalchemy import select, insert
 
 from app.models.client import Client
 from app.models.ad_account import AdAccount
 from app.models.campaign import Campaign
 from app.models.ad_set import AdSet
 from app.models.optimization_log import OptimizationLog
+from app.models.types import uuid7
 from app.services.meta_ads import MetaAdsService
 from app.services.google_ads import GoogleAdsService
 
 logger = logging.getLogger(__name__)
 
 
+async def _insert_logs(db: AsyncSession, logs: list[dict]):
+    """Write a run's optimization logs as one bulk INSERT."""
+    if logs:
+        # Autoflush writes the campaigns the logs reference first
+        await db.execute(insert(OptimizationLog), logs)
+
+
+_META_BASE_TARGETING = {
+    "age_min": 18,
+    "age_max": 65,
+    "publisher_platforms": ["facebook", "instagram"],
+}
+_META_RETARGETING = {
+    **_META_BASE_TARGETING,
+    "custom_audiences": [],  # Populated with retargeting audience ID
+}
+_META_TARGETING = {
+    "broad": _META_BASE_TARGETING,
+    "interest": {
+        **_META_BASE_TARGETING,
+        "flexible_spec": [{"interests": []}],  # Populated per client
+    },
+    "lookalike": {
+        **_META_BASE_TARGETING,
+        "custom_audiences": [],  # Populated with lookalike audience ID
+    },
+    "website_visitors": _META_RETARGETING,
+    "engaged_users": _META_RETARGETING,
+    "cart_abandoners": _META_RETARGETING,
+}
+
+
 class CampaignCreator:
     """Creates campaigns on Meta and Google based on strategy engine output."""
 
@@ -39,17 +74,27 @@ class CampaignCreator:
             )
             accounts = result.scalars().all()
 
-            meta_accounts = [a for a in accounts if a.platform == "meta"]
-            google_accounts = [a for a in accounts if a.platform == "google"]
-
-            campaign_structure = strategy.get("campaign_structure", {})
-
-            for meta_acct in meta_accounts:
-                await self._create_meta_campaigns(db, client_obj, meta_acct, campaign_structure)
-
-            for google_acct in google_accounts:
-                await self._create_google_campaigns(db, client_obj, google_acct, campaign_structure)
+        campaign_structure = strategy.get("campaign_structure", {})
+
+        # Each account is an independent tree of platform calls, so accounts run
+        # concurrently; AsyncSession is not safe to share, so each gets its own
+        jobs = [
+            (self._create_meta_campaigns if account.platform == "meta" else self._create_google_campaigns, account)
+            for account in accounts
+            if account.platform in ("meta", "google")
+        ]
+        results = await asyncio.gather(
+            *(self._create_for_account(create, client_obj, account, campaign_structure) for create, account in jobs),
+            return_exceptions=True,
+        )
+        for (_, account), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.error(f"Campaign creation failed for {account.platform} account {account.account_id}: {result}")
 
+    async def _create_for_account(self, create, client_obj: Client, account: AdAccount, structure: dict):
+        """Run one account's campaign creation in its own session and commit it."""
+        async with self.session_factory() as db:
+            await create(db, client_obj, account, structure)
             await db.commit()
 
     async def _create_meta_campaigns(
@@ -60,6 +105,13 @@ class CampaignCreator:
             app_id=client_obj.meta_app_id,
             app_secret=client_obj.meta_app_secret
         )
+        # Loop-invariant values are bound once rather than re-read off the ORM objects
+        client_id, account_id, access_token = client_obj.id, account.account_id, account.access_token
+
+        # Rows are collected and added together so the commit flushes them as
+        # one batched INSERT per table; logs skip the ORM and go in as plain rows
+        rows = []
+        logs = []
 
         for campaign_type, config in structure.items():
             daily_budget = config.get("daily_budget", 0)
@@ -68,10 +120,10 @@ class CampaignCreator:
 
             try:
                 # Create campaign on Meta
-                name = f"FAGE_{campaign_type.title()}_{account.account_id[:8]}"
+                name = f"FAGE_{campaign_type.title()}_{account_id[:8]}"
                 meta_response = await meta.create_campaign(
-                    account_id=account.account_id,
-                    access_token=account.access_token,
+                    account_id=account_id,
+                    access_token=access_token,
                     name=name,
                     objective="OUTCOME_SALES",
                     daily_budget=daily_budget,
@@ -80,8 +132,9 @@ class CampaignCreator:
 
                 platform_campaign_id = meta_response.get("id")
 
-                # Save campaign to DB
+                # The id is assigned up front so children can reference it without a flush
                 campaign = Campaign(
+                    id=uuid7(),
                     client_id=client_id,
                     ad_account_id=account.id,
                     platform_campaign_id=platform_campaign_id,
@@ -92,63 +145,71 @@ class CampaignCreator:
                     status="paused",
                     daily_budget=daily_budget,
                 )
-                db.add(campaign)
-                await db.flush()
-
-                # Create ad sets
-                for ad_set_config in config.get("ad_sets", []):
-                    ad_set_budget = daily_budget * ad_set_config["budget_pct"]
-                    ad_set_type = ad_set_config["type"]
-
-                    targeting = self._get_meta_targeting(ad_set_type)
-
-                    try:
-                        adset_response = await meta.create_ad_set(
-                            account_id=account.account_id,
-                            access_token=account.access_token,
+                rows.append(campaign)
+
+                # Ad sets under one campaign are independent, so create them together
+                ad_set_specs = [
+                    (
+                        cfg["type"],
+                        daily_budget * cfg["budget_pct"],
+                        self._get_meta_targeting(cfg["type"]),
+                    )
+                    for cfg in config.get("ad_sets", [])
+                ]
+                results = await asyncio.gather(
+                    *(
+                        meta.create_ad_set(
+                            account_id=account_id,
+                            access_token=access_token,
                             campaign_id=platform_campaign_id,
                             name=f"{name}_{ad_set_type}",
                             daily_budget=ad_set_budget,
                             targeting=targeting,
                             status="PAUSED",
                         )
+                        for ad_set_type, ad_set_budget, targeting in ad_set_specs
+                    ),
+                    return_exceptions=True,
+                )
 
-                        ad_set = AdSet(
-                            campaign_id=campaign.id,
-                            platform_adset_id=adset_response.get("id"),
-                            name=f"{name}_{ad_set_type}",
-                            targeting_type=ad_set_type,
-                            status="paused",
-                            daily_budget=ad_set_budget,
-                            targeting_spec=targeting,
-                        )
-                        db.add(ad_set)
-                    except Exception as e:
-                        logger.error(f"Failed to create ad set {ad_set_type}: {e}")
+                for (ad_set_type, ad_set_budget, targeting), adset_response in zip(ad_set_specs, results):
+                    if isinstance(adset_response, Exception):
+                        logger.error(f"Failed to create ad set {ad_set_type}: {adset_response}")
+                        continue
+                    rows.append(AdSet(
+                        campaign_id=campaign.id,
+                        platform_adset_id=adset_response.get("id"),
+                        name=f"{name}_{ad_set_type}",
+                        targeting_type=ad_set_type,
+                        status="paused",
+                        daily_budget=ad_set_budget,
+                        targeting_spec=targeting,
+                    ))
 
                 # Log action
-                log = OptimizationLog(
-                    client_id=client_id,
-                    campaign_id=campaign.id,
-                    action="campaign_created",
-                    reason=f"Strategy-driven {campaign_type} campaign",
-                    entity_type="campaign",
-                    entity_id=platform_campaign_id,
-                    status="completed",
-                )
-                db.add(log)
+                logs.append({
+                    "client_id": client_id,
+                    "campaign_id": campaign.id,
+                    "action": "campaign_created",
+                    "reason": f"Strategy-driven {campaign_type} campaign",
+                    "entity_type": "campaign",
+                    "entity_id": platform_campaign_id,
+                    "status": "completed",
+                })
 
             except Exception as e:
                 logger.error(f"Failed to create Meta {campaign_type} campaign: {e}")
-                log = OptimizationLog(
-                    client_id=client_id,
-                    action="campaign_creation_failed",
-                    reason=str(e),
-                    entity_type="campaign",
-                    status="failed",
-                    error_message=str(e),
-                )
-                db.add(log)
+                logs.append({
+                    "client_id": client_id,
+                    "action": "campaign_creation_failed",
+                    "reason": str(e),
+                    "entity_type": "campaign",
+                    "status": "failed",
+                    "error_message": str(e),
+                })
+
+        db.add_all(rows)
+        await _insert_logs(db, logs)
 
     async def _create_google_campaigns(
         self, db: AsyncSession, client_obj: Client, account: AdAccount, structure: dict
@@ -160,16 +221,19 @@ class CampaignCreator:
             developer_token=client_obj.google_developer_token
         )
 
+        client_id, account_id, access_token = client_obj.id, account.account_id, account.access_token
+        logs = []
+
         # Create Shopping campaign for prospecting
         prospecting = structure.get("prospecting", {})
         budget = prospecting.get("daily_budget", 0)
 
         if budget > 0:
             try:
-                name = f"FAGE_Shopping_{account.account_id[:8]}"
+                name = f"FAGE_Shopping_{account_id[:8]}"
                 google_response = await google.create_campaign(
-                    customer_id=account.account_id,
-                    access_token=account.access_token,
+                    customer_id=account_id,
+                    access_token=access_token,
                     name=name,
                     channel_type="SHOPPING",
                     budget_amount_micros=int(budget * 1_000_000),
@@ -189,17 +253,16 @@ class CampaignCreator:
                     status="paused",
                     daily_budget=budget,
                 )
-                db.add(campaign)
 
-                log = OptimizationLog(
-                    client_id=client_id,
-                    action="campaign_created",
-                    reason="Strategy-driven Google Shopping campaign",
-                    entity_type="campaign",
-                    entity_id=campaign_resource,
-                    status="completed",
-                )
-                db.add(log)
+                db.add(campaign)
+                logs.append({
+                    "client_id": client_id,
+                    "action": "campaign_created",
+                    "reason": "Strategy-driven Google Shopping campaign",
+                    "entity_type": "campaign",
+                    "entity_id": campaign_resource,
+                    "status": "completed",
+                })
 
             except Exception as e:
                 logger.error(f"Failed to create Google campaign: {e}")
@@ -210,10 +273,10 @@ class CampaignCreator:
 
         if retargeting_budget > 0:
             try:
-                name = f"FAGE_Search_{account.account_id[:8]}"
+                name = f"FAGE_Search_{account_id[:8]}"
                 await google.create_campaign(
-                    customer_id=account.account_id,
-                    access_token=account.access_token,
+                    customer_id=account_id,
+                    access_token=access_token,
                     name=name,
                     channel_type="SEARCH",
                     budget_amount_micros=int(retargeting_budget * 1_000_000),
@@ -222,31 +285,10 @@ class CampaignCreator:
             except Exception as e:
                 logger.error(f"Failed to create Google Search campaign: {e}")
 
+        await _insert_logs(db, logs)
+
     @staticmethod
     def _get_meta_targeting(ad_set_type: str) -> dict:
         """Get Meta targeting spec based on ad set type."""
-        base_targeting = {
-            "age_min": 18,
-            "age_max": 65,
-            "publisher_platforms": ["facebook", "instagram"],
-        }
-
-        if ad_set_type == "broad":
-            return {**base_targeting}
-        elif ad_set_type == "interest":
-            return {
-                **base_targeting,
-                "flexible_spec": [{"interests": []}],  # Populated per client
-            }
-        elif ad_set_type == "lookalike":
-            return {
-                **base_targeting,
-                "custom_audiences": [],  # Populated with lookalike audience ID
-            }
-        elif ad_set_type in ("website_visitors", "engaged_users", "cart_abandoners"):
-            return {
-                **base_targeting,
-                "custom_audiences": [],  # Populated with retargeting audience ID
-            }
-        else:
-            return base_targeting
+        # Specs are built once at import; callers get their own copy to populate
+        return copy.deepcopy(_META_TARGETING.get(ad_set_type, _META_BASE_TARGETING))
@@ -1,9 +1,12 @@
 """Data Collection Service - scheduled data sync from ad platforms."""
 
+import asyncio
+import functools
 import logging
-from datetime import date, timedelta
+from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy import select
+from sqlalchemy import select, insert, tuple_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.models.client import Client, AutomationStatus
 from app.models.ad_account import AdAccount
@@ -12,10 +15,21 @@ from app.models.daily_metrics import DailyMetrics
 from app.services.meta_ads import MetaAdsService
 from app.services.google_ads import GoogleAdsService
 from app.services.ga4 import GA4Service
-from app.utils.helpers import safe_divide, calculate_roas, calculate_cpa, calculate_ctr
+from app.config import settings
+from app.utils.helpers import get_date_range
 
 logger = logging.getLogger(__name__)
 
+METRICS_BATCH_SIZE = 500
+SYNC_WINDOW_DAYS = 7  # Re-read so late attribution updates land on past days
+SYNC_LOCK_NAMESPACE = 0x5359  # First key of the per-client sync advisory lock
+METRICS_UPDATE_COLUMNS = (
+    "spend", "impressions", "clicks", "conversions", "revenue", "frequency", "reach",
+)
+
+# A sync window spans a handful of distinct days repeated across every campaign
+_parse_day = functools.lru_cache(maxsize=64)(date.fromisoformat)
+
 
 class DataCollector:
     """Collects and stores performance data from all connected ad platforms."""
@@ -27,25 +41,40 @@ class DataCollector:
         """Sync data for all active clients. Called by scheduler."""
         async with self.session_factory() as db:
             result = await db.execute(
-                select(Client).where(
+                select(Client.id).where(
                     Client.is_active == True,
                     Client.automation_status.in_([
                         AutomationStatus.ACTIVE, AutomationStatus.DEPLOYING
                     ]),
                 )
             )
-            clients = result.scalars().all()
+            client_ids = result.scalars().all()
+
+        # Clients are independent; bound concurrency to stay within the DB pool
+        semaphore = asyncio.Semaphore(settings.SCHEDULER_CLIENT_CONCURRENCY)
+
+        async def sync(client_id):
+            async with semaphore:
+                try:
+                    await self.sync_client(client_id)
+                    logger.info(f"Data sync completed for client {client_id}")
+                except Exception as e:
+                    logger.error(f"Data sync failed for client {client_id}: {e}")
 
-        for client in clients:
-            try:
-                await self.sync_client(client.id)
-                logger.info(f"Data sync completed for client {client.id}")
-            except Exception as e:
-                logger.error(f"Data sync failed for client {client.id}: {e}")
+        await asyncio.gather(*(sync(client_id) for client_id in client_ids))
 
     async def sync_client(self, client_id):
         """Sync all data for a single client."""
         async with self.session_factory() as db:
+            # Every worker process runs its own scheduler; a transaction-scoped
+            # advisory lock (released on commit) lets only one sync a client at a time
+            locked = await db.scalar(
+                select(func.pg_try_advisory_xact_lock(SYNC_LOCK_NAMESPACE, func.hashtext(str(client_id))))
+            )
+            if not locked:
+                logger.info(f"Data sync for client {client_id} already running elsewhere, skipping")
+                return
+
             # Get client for credentials
             result = await db.execute(select(Client).where(Client.id == client_id))
             client_obj = result.scalar_one_or_none()
@@ -61,35 +90,55 @@ class DataCollector:
             )
             accounts = result.scalars().all()
 
-            for account in accounts:
+            # One service per platform for the whole client, shared by its accounts
+            meta = MetaAdsService(
+                app_id=client_obj.meta_app_id,
+                app_secret=client_obj.meta_app_secret
+            )
+            google = GoogleAdsService(
+                client_id=client_obj.google_client_id,
+                client_secret=client_obj.google_client_secret,
+                developer_token=client_obj.google_developer_token
+            )
+            ga4 = GA4Service()
+
+            # Accounts fetch from their platforms concurrently; the lock hands the
+            # session to one writer at a time so all writes share one transaction
+            db_lock = asyncio.Lock()
+
+            async def sync_account(account: AdAccount):
                 try:
                     if account.platform == "meta":
-                        await self._sync_meta(db, client_obj, account)
+                        await self._sync_meta(db, db_lock, client_obj, account, meta)
                     elif account.platform == "google":
-                        await self._sync_google(db, client_obj, account)
-                        # Also sync GA4 if property ID is set
+                        # GA4 (when a property ID is set) only reads and logs for now, so it
+                        # runs alongside the Google Ads sync instead of after it
                         if client_obj.ga4_property_id:
-                            await self._sync_ga4(db, client_obj, account)
+                            await asyncio.gather(
+                                self._sync_google(db, db_lock, client_obj, account, google),
+                                self._sync_ga4(db, client_obj, account, ga4),
+                            )
+                        else:
+                            await self._sync_google(db, db_lock, client_obj, account, google)
                 except Exception as e:
                     logger.error(f"Failed to sync {account.platform} account {account.account_id}: {e}")
 
+            await asyncio.gather(*(sync_account(account) for account in accounts))
             await db.commit()
 
-    async def _sync_ga4(self, db: AsyncSession, client_obj: Client, account: AdAccount):
+    async def _sync_ga4(self, db: AsyncSession, client_obj: Client, account: AdAccount, ga4: GA4Service):
         """Sync GA4 data if property ID is present."""
-        ga4 = GA4Service()
-        end_date = date.today() - timedelta(days=1)
-        start_date = end_date - timedelta(days=6)
+        start_date, end_date = get_date_range(SYNC_WINDOW_DAYS)
 
         try:
-            metrics = await ga4.fetch_metrics(
+            metrics = ga4.fetch_metrics(
                 property_id=client_obj.ga4_property_id,
                 access_token=account.access_token,
                 date_start=start_date.isoformat(),
                 date_end=end_date.isoformat(),
             )
 
-            for row in metrics:
+            async for row in metrics:
                 # GA4 metrics are stored per client/platform, not campaign (usually)
                 # But for now, we can store them in a special "organic" or "total" campaign record
                 # or just use them for verification. 
@@ -100,14 +149,11 @@ class DataCollector:
         except Exception as e:
             logger.error(f"GA4 sync failed for client {client_obj.id}: {e}")
 
-    async def _sync_meta(self, db: AsyncSession, client_obj: Client, account: AdAccount):
+    async def _sync_meta(
+        self, db: AsyncSession, db_lock: asyncio.Lock, client_obj: Client, account: AdAccount, meta: MetaAdsService,
+    ):
         """Sync Meta Ads data for the last 7 days."""
-        meta = MetaAdsService(
-            app_id=client_obj.meta_app_id,
-            app_secret=client_obj.meta_app_secret
-        )
-        end_date = date.today() - timedelta(days=1)
-        start_date = end_date - timedelta(days=6)
+        start_date, end_date = get_date_range(SYNC_WINDOW_DAYS)
 
         insights = await meta.fetch_campaign_insights(
             account_id=account.account_id,
@@ -116,40 +162,34 @@ class DataCollector:
             date_end=end_date.isoformat(),
         )
 
+        rows = []
         for row in insights:
-            campaign_id = row.get("campaign_id")
             row_date = row.get("date_start", str(end_date))
             spend = float(row.get("spend", 0))
             impressions = int(row.get("impressions", 0))
             clicks = int(row.get("clicks", 0))
-            conversions = meta.parse_conversions(row.get("actions", []))
-            revenue = meta.parse_revenue(row.get("action_values", []))
-
-            # Find or create campaign record
-            campaign = await self._ensure_campaign(
-                db, client_obj.id, account.id, campaign_id,
-                row.get("campaign_name", "Unknown"), "meta"
-            )
+            conversions, revenue = meta.parse_purchases(row.get("actions"), row.get("action_values"))
 
-            # Upsert daily metrics
-            await self._upsert_metrics(
-                db, client_obj.id, campaign.id, "meta",
-                date.fromisoformat(row_date[:10]),
+            rows.append(self._metrics_row(
+                client_obj.id, row.get("campaign_id"), "meta",
+                _parse_day(row_date[:10]),
                 spend=spend, impressions=impressions, clicks=clicks,
                 conversions=conversions, revenue=revenue,
                 frequency=float(row.get("frequency", 0)),
                 reach=int(row.get("reach", 0)),
+            ))
+
+        async with db_lock:
+            await self._store_metrics(
+                db, client_obj.id, account.id, "meta", rows,
+                {row.get("campaign_id"): row.get("campaign_name", "Unknown") for row in insights},
             )
 
-    async def _sync_google(self, db: AsyncSession, client_obj: Client, account: AdAccount):
+    async def _sync_google(
+        self, db: AsyncSession, db_lock: asyncio.Lock, client_obj: Client, account: AdAccount, google: GoogleAdsService,
+    ):
         """Sync Google Ads data for the last 7 days."""
-        google = GoogleAdsService(
-            client_id=client_obj.google_client_id,
-            client_secret=client_obj.google_client_secret,
-            developer_token=client_obj.google_developer_token
-        )
-        end_date = date.today() - timedelta(days=1)
-        start_date = end_date - timedelta(days=6)
+        start_date, end_date = get_date_range(SYNC_WINDOW_DAYS)
 
         performance = await google.fetch_campaign_performance(
             customer_id=account.account_id,
@@ -158,95 +198,102 @@ class DataCollector:
             date_end=end_date.isoformat(),
         )
 
+        rows = []
         for row in performance:
-            campaign = await self._ensure_campaign(
-                db, client_obj.id, account.id,
-                str(row["campaign_id"]), row["campaign_name"], "google"
-            )
-            await self._upsert_metrics(
-                db, client_obj.id, campaign.id, "google",
-                date.fromisoformat(row["date"]),
+            rows.append(self._metrics_row(
+                client_obj.id, str(row["campaign_id"]), "google",
+                _parse_day(row["date"]),
                 spend=row["spend"], impressions=row["impressions"],
                 clicks=row["clicks"], conversions=row["conversions"],
                 revenue=row["revenue"],
+            ))
+
+        async with db_lock:
+            await self._store_metrics(
+                db, client_obj.id, account.id, "google", rows,
+                {str(row["campaign_id"]): row["campaign_name"] for row in performance},
             )
 
-    async def _ensure_campaign(
-        self, db: AsyncSession, client_id, ad_account_id,
-        platform_campaign_id: str, name: str, platform: str,
-    ) -> Campaign:
-        """Get or create a campaign reference in the DB."""
+    async def _store_metrics(
+        self, db: AsyncSession, client_id, ad_account_id, platform: str,
+        rows: list[dict], names: dict[str, str],
+    ):
+        """Swap platform campaign IDs in fetched rows for DB IDs and upsert them."""
+        # Find or create every campaign record up front, in one lookup
+        campaign_ids = await self._ensure_campaigns(db, client_id, ad_account_id, platform, names)
+        for row in rows:
+            row["campaign_id"] = campaign_ids[row["campaign_id"]]
+        await self._upsert_metrics(db, rows)
+
+    async def _ensure_campaigns(
+        self, db: AsyncSession, client_id, ad_account_id, platform: str,
+        names: dict[str, str],
+    ) -> dict:
+        """Map platform campaign IDs to DB campaign IDs, creating any that are missing."""
+        if not names:
+            return {}
+
         result = await db.execute(
-            select(Campaign).where(
+            select(Campaign.platform_campaign_id, Campaign.id).where(
                 Campaign.client_id == client_id,
-                Campaign.platform_campaign_id == platform_campaign_id,
+                Campaign.platform_campaign_id.in_(names),
             )
         )
-        campaign = result.scalar_one_or_none()
-        if not campaign:
-            campaign = Campaign(
-                client_id=client_id,
-                ad_account_id=ad_account_id,
-                platform_campaign_id=platform_campaign_id,
-                name=name,
-                platform=platform,
-                status="active",
+        campaign_ids = dict(result.all())
+
+        # New campaigns go in as plain rows; nothing here needs ORM instances
+        new_campaigns = [
+            {
+                "client_id": client_id,
+                "ad_account_id": ad_account_id,
+                "platform_campaign_id": platform_campaign_id,
+                "name": name,
+                "platform": platform,
+                "status": "active",
+            }
+            for platform_campaign_id, name in names.items()
+            if platform_campaign_id not in campaign_ids
+        ]
+        if new_campaigns:
+            result = await db.execute(
+                insert(Campaign).values(new_campaigns).returning(Campaign.platform_campaign_id, Campaign.id)
             )
-            db.add(campaign)
-            await db.flush()
-        return campaign
+            campaign_ids.update(result.all())
+        return campaign_ids
 
-    async def _upsert_metrics(
-        self, db: AsyncSession, client_id, campaign_id,
-        platform: str, metric_date: date, **kwargs,
-    ):
-        """Insert or update daily metrics."""
-        spend = kwargs.get("spend", 0)
-        impressions = kwargs.get("impressions", 0)
-        clicks = kwargs.get("clicks", 0)
-        conversions = kwargs.get("conversions", 0)
-        revenue = kwargs.get("revenue", 0)
+    @staticmethod
+    def _metrics_row(
+        client_id, campaign_id, platform: str, metric_date: date, **kwargs,
+    ) -> dict:
+        """Build a DailyMetrics row; ratio columns are generated by Postgres."""
+        return {
+            "client_id": client_id,
+            "campaign_id": campaign_id,
+            "platform": platform,
+            "date": metric_date,
+            "spend": kwargs.get("spend", 0),
+            "impressions": kwargs.get("impressions", 0),
+            "clicks": kwargs.get("clicks", 0),
+            "conversions": kwargs.get("conversions", 0),
+            "revenue": kwargs.get("revenue", 0),
+            "frequency": kwargs.get("frequency", 0),
+            "reach": kwargs.get("reach", 0),
+        }
 
-        result = await db.execute(
-            select(DailyMetrics).where(
-                DailyMetrics.client_id == client_id,
-                DailyMetrics.campaign_id == campaign_id,
-                DailyMetrics.platform == platform,
-                DailyMetrics.date == metric_date,
-            )
-        )
-        metrics = result.scalar_one_or_none()
-
-        if metrics:
-            metrics.spend = spend
-            metrics.impressions = impressions
-            metrics.clicks = clicks
-            metrics.conversions = conversions
-            metrics.revenue = revenue
-            metrics.ctr = calculate_ctr(clicks, impressions)
-            metrics.cpc = safe_divide(spend, clicks)
-            metrics.cpm = safe_divide(spend * 1000, impressions)
-            metrics.roas = calculate_roas(revenue, spend)
-            metrics.cpa = calculate_cpa(spend, conversions)
-            metrics.frequency = kwargs.get("frequency", 0)
-            metrics.reach = kwargs.get("reach", 0)
-        else:
-            metrics = DailyMetrics(
-                client_id=client_id,
-                campaign_id=campaign_id,
-                platform=platform,
-                date=metric_date,
-                spend=spend,
-                impressions=impressions,
-                clicks=clicks,
-                ctr=calculate_ctr(clicks, impressions),
-                cpc=safe_divide(spend, clicks),
-                cpm=safe_divide(spend * 1000, impressions),
-                conversions=conversions,
-                revenue=revenue,
-                roas=calculate_roas(revenue, spend),
-                cpa=calculate_cpa(spend, conversions),
-                frequency=kwargs.get("frequency", 0),
-                reach=kwargs.get("reach", 0),
+    async def _upsert_metrics(self, db: AsyncSession, rows: list[dict]):
+        """Insert or update daily metrics in multi-row INSERT ... ON CONFLICT batches."""
+        # One statement cannot touch the same conflict key twice; keep the last row per key
+        unique_rows = list({
+            (r["client_id"], r["campaign_id"], r["platform"], r["date"]): r for r in rows
+        }.values())
+
+        for i in range(0, len(unique_rows), METRICS_BATCH_SIZE):
+            stmt = pg_insert(DailyMetrics).values(unique_rows[i:i + METRICS_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_daily_metrics",
+                set_={col: stmt.excluded[col] for col in METRICS_UPDATE_COLUMNS},
+                # Most of the window is unchanged between runs; don't rewrite those rows
+                where=tuple_(*(DailyMetrics.__table__.c[col] for col in METRICS_UPDATE_COLUMNS))
+                .is_distinct_from(tuple_(*(stmt.excluded[col] for col in METRICS_UPDATE_COLUMNS))),
             )
-            db.add(metrics)
+            await db.execute(stmt)
@@ -1,14 +1,23 @@
 """Google Analytics 4 data service."""
 
-import httpx
-from typing import Optional
+from typing import AsyncIterator, Optional
 from app.config import settings
+from app.utils.http import request_with_retry
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
 GA4_API_URL = "https://analyticsdata.googleapis.com/v1beta"
 
+_REPORT_METRICS = [
+    {"name": "sessions"},
+    {"name": "totalRevenue"},
+    {"name": "conversions"},
+    {"name": "bounceRate"},
+    {"name": "averageSessionDuration"},
+]
+
 
 class GA4Service:
     """Client for Google Analytics 4 Data API."""
@@ -19,38 +28,33 @@ class GA4Service:
     async def fetch_metrics(
         self, property_id: str, access_token: str,
         date_start: str, date_end: str,
-    ) -> list[dict]:
-        """Fetch daily GA4 metrics: sessions, revenue, conversions."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{GA4_API_URL}/properties/{property_id}:runReport",
-                headers={"Authorization": f"Bearer {access_token}"},
-                json={
-                    "dateRanges": [{"startDate": date_start, "endDate": date_end}],
-                    "dimensions": [{"name": "date"}],
-                    "metrics": [
-                        {"name": "sessions"},
-                        {"name": "totalRevenue"},
-                        {"name": "conversions"},
-                        {"name": "bounceRate"},
-                        {"name": "averageSessionDuration"},
-                    ],
-                    "orderBys": [{"dimension": {"dimensionName": "date"}}],
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            parsed = []
-            for row in data.get("rows", []):
-                dims = row.get("dimensionValues", [])
-                mets = row.get("metricValues", [])
-                parsed.append({
-                    "date": dims[0]["value"] if dims else None,
-                    "sessions": int(mets[0]["value"]) if len(mets) > 0 else 0,
-                    "revenue": float(mets[1]["value"]) if len(mets) > 1 else 0.0,
-                    "conversions": int(float(mets[2]["value"])) if len(mets) > 2 else 0,
-                    "bounce_rate": float(mets[3]["value"]) if len(mets) > 3 else 0.0,
-                    "avg_session_duration": float(mets[4]["value"]) if len(mets) > 4 else 0.0,
-                })
-            return parsed
+    ) -> AsyncIterator[dict]:
+        """Yield daily GA4 metrics: sessions, revenue, conversions."""
+        response = await request_with_retry(
+            "POST",
+            f"{GA4_API_URL}/properties/{property_id}:runReport",
+            headers={"Authorization": f"Bearer {access_token}"},
+            json={
+                "dateRanges": [{"startDate": date_start, "endDate": date_end}],
+                "dimensions": [{"name": "date"}],
+                "metrics": _REPORT_METRICS,
+                "orderBys": [{"dimension": {"dimensionName": "date"}}],
+            },
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        for row in data.get("rows", []):
+            dims = row.get("dimensionValues", [])
+            # Values arrive in _REPORT_METRICS order; pad once instead of guarding each index
+            values = [m["value"] for m in row.get("metricValues", ())]
+            values += ["0"] * (len(_REPORT_METRICS) - len(values))
+            sessions, revenue, conversions, bounce_rate, avg_session_duration = values[:len(_REPORT_METRICS)]
+            yield {
+                "date": dims[0]["value"] if dims else None,
+                "sessions": int(sessions),
+                "revenue": float(revenue),
+                "conversions": int(float(conversions)),
+                "bounce_rate": float(bounce_rate),
+                "avg_session_duration": float(avg_session_duration),
+            }
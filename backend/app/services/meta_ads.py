@@ -1,13 +1,18 @@
 """Meta Marketing API service - handles all Meta/Facebook Ads interactions."""
 
-import httpx
 from typing import Optional
+from urllib.parse import urlencode
 from app.config import settings
+from app.utils.http import get_http_client, request_with_retry
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
 META_GRAPH_URL = "https://graph.facebook.com/v18.0"
+META_BATCH_LIMIT = 50  # Sub-requests the Graph API accepts per batch call
+PURCHASE_ACTION_TYPE = "purchase"
+PIXEL_PURCHASE_ACTION_TYPE = "offsite_conversion.fb_pixel_purchase"
 
 
 class MetaAdsService:
@@ -26,65 +31,66 @@ class MetaAdsService:
     async def exchange_code(self, code: str, redirect_uri: Optional[str] = None) -> dict:
         """Exchange OAuth authorization code for access token."""
         uri = redirect_uri or settings.META_REDIRECT_URI
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{META_GRAPH_URL}/oauth/access_token",
-                params={
-                    "client_id": self.app_id,
-                    "client_secret": self.app_secret,
-                    "redirect_uri": uri,
-                    "code": code,
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            # Exchange short-lived token for long-lived token
-            long_lived = await client.get(
-                f"{META_GRAPH_URL}/oauth/access_token",
-                params={
-                    "grant_type": "fb_exchange_token",
-                    "client_id": self.app_id,
-                    "client_secret": self.app_secret,
-                    "fb_exchange_token": data["access_token"],
-                },
-            )
-            long_lived.raise_for_status()
-            return long_lived.json()
+        client = get_http_client()
+        response = await client.get(
+            f"{META_GRAPH_URL}/oauth/access_token",
+            params={
+                "client_id": self.app_id,
+                "client_secret": self.app_secret,
+                "redirect_uri": uri,
+                "code": code,
+            },
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        # Exchange short-lived token for long-lived token
+        long_lived = await client.get(
+            f"{META_GRAPH_URL}/oauth/access_token",
+            params={
+                "grant_type": "fb_exchange_token",
+                "client_id": self.app_id,
+                "client_secret": self.app_secret,
+                "fb_exchange_token": data["access_token"],
+            },
+        )
+        long_lived.raise_for_status()
+        return orjson.loads(long_lived.content)
 
     async def get_ad_accounts(self, access_token: str) -> list[dict]:
         """Get all ad accounts accessible to the user."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{META_GRAPH_URL}/me/adaccounts",
-                params={
-                    "access_token": access_token,
-                    "fields": "id,name,account_status,currency,timezone_name",
-                },
-            )
-            response.raise_for_status()
-            return response.json().get("data", [])
+        client = get_http_client()
+        response = await client.get(
+            f"{META_GRAPH_URL}/me/adaccounts",
+            params={
+                "access_token": access_token,
+                "fields": "id,name,account_status,currency,timezone_name",
+            },
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content).get("data", [])
 
     async def fetch_campaign_insights(
         self, account_id: str, access_token: str, date_start: str, date_end: str
     ) -> list[dict]:
         """Fetch campaign-level insights from Meta Ads."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{META_GRAPH_URL}/act_{account_id}/insights",
-                params={
-                    "access_token": access_token,
-                    "level": "campaign",
-                    "fields": (
-                        "campaign_id,campaign_name,spend,impressions,clicks,"
-                        "ctr,cpc,cpm,actions,action_values,frequency,reach"
-                    ),
-                    "time_range": f'{{"since":"{date_start}","until":"{date_end}"}}',
-                    "time_increment": 1,  # Daily breakdown
-                },
-            )
-            response.raise_for_status()
-            return response.json().get("data", [])
+        response = await request_with_retry(
+            "GET",
+            f"{META_GRAPH_URL}/act_{account_id}/insights",
+            params={
+                "access_token": access_token,
+                "level": "campaign",
+                # Ratios are derived in Postgres, so only the raw counters are requested
+                "fields": (
+                    "campaign_id,campaign_name,spend,impressions,clicks,"
+                    "actions,action_values,frequency,reach"
+                ),
+                "time_range": f'{{"since":"{date_start}","until":"{date_end}"}}',
+                "time_increment": 1,  # Daily breakdown
+            },
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content).get("data", [])
 
     async def create_campaign(
         self, account_id: str, access_token: str,
@@ -92,20 +98,20 @@ class MetaAdsService:
         daily_budget: float = 0, status: str = "PAUSED",
     ) -> dict:
         """Create a new campaign on Meta."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{META_GRAPH_URL}/act_{account_id}/campaigns",
-                params={"access_token": access_token},
-                json={
-                    "name": name,
-                    "objective": objective,
-                    "status": status,
-                    "special_ad_categories": [],
-                    "daily_budget": int(daily_budget * 100),  # Meta uses cents
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.post(
+            f"{META_GRAPH_URL}/act_{account_id}/campaigns",
+            params={"access_token": access_token},
+            json={
+                "name": name,
+                "objective": objective,
+                "status": status,
+                "special_ad_categories": [],
+                "daily_budget": int(daily_budget * 100),  # Meta uses cents
+            },
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def create_ad_set(
         self, account_id: str, access_token: str,
@@ -114,23 +120,23 @@ class MetaAdsService:
         billing_event: str = "IMPRESSIONS", status: str = "PAUSED",
     ) -> dict:
         """Create an ad set within a campaign."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{META_GRAPH_URL}/act_{account_id}/adsets",
-                params={"access_token": access_token},
-                json={
-                    "name": name,
-                    "campaign_id": campaign_id,
-                    "daily_budget": int(daily_budget * 100),
-                    "targeting": targeting,
-                    "optimization_goal": optimization_goal,
-                    "billing_event": billing_event,
-                    "status": status,
-                    "bid_strategy": "LOWEST_COST_WITHOUT_CAP",
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.post(
+            f"{META_GRAPH_URL}/act_{account_id}/adsets",
+            params={"access_token": access_token},
+            json={
+                "name": name,
+                "campaign_id": campaign_id,
+                "daily_budget": int(daily_budget * 100),
+                "targeting": targeting,
+                "optimization_goal": optimization_goal,
+                "billing_event": billing_event,
+                "status": status,
+                "bid_strategy": "LOWEST_COST_WITHOUT_CAP",
+            },
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def create_ad(
         self, account_id: str, access_token: str,
@@ -138,62 +144,90 @@ class MetaAdsService:
         status: str = "PAUSED",
     ) -> dict:
         """Create an ad within an ad set."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{META_GRAPH_URL}/act_{account_id}/ads",
-                params={"access_token": access_token},
-                json={
-                    "name": name,
-                    "adset_id": ad_set_id,
-                    "creative": {"creative_id": creative_id},
-                    "status": status,
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.post(
+            f"{META_GRAPH_URL}/act_{account_id}/ads",
+            params={"access_token": access_token},
+            json={
+                "name": name,
+                "adset_id": ad_set_id,
+                "creative": {"creative_id": creative_id},
+                "status": status,
+            },
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def update_campaign_budget(
         self, campaign_id: str, access_token: str, daily_budget: float
     ) -> dict:
         """Update a campaign's daily budget."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{META_GRAPH_URL}/{campaign_id}",
-                params={"access_token": access_token},
-                json={"daily_budget": int(daily_budget * 100)},
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.post(
+            f"{META_GRAPH_URL}/{campaign_id}",
+            params={"access_token": access_token},
+            json={"daily_budget": int(daily_budget * 100)},
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def update_campaign_status(
         self, campaign_id: str, access_token: str, status: str
     ) -> dict:
         """Pause or activate a campaign."""
-        async with httpx.AsyncClient() as client:
+        client = get_http_client()
+        response = await client.post(
+            f"{META_GRAPH_URL}/{campaign_id}",
+            params={"access_token": access_token},
+            json={"status": status},  # ACTIVE or PAUSED
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    @staticmethod
+    def campaign_update_request(campaign_id: str, **fields) -> dict:
+        """Batch sub-request that updates fields on a campaign."""
+        return {"method": "POST", "relative_url": campaign_id, "body": urlencode(fields)}
+
+    async def submit_batch(self, access_token: str, requests: list[dict]) -> list[Optional[dict]]:
+        """Run Graph API sub-requests, up to META_BATCH_LIMIT per HTTP call.
+
+        Returns one entry per request in order: a dict with the sub-request's
+        ``code`` and ``body``, or None if Meta did not get to run it.
+        """
+        client = get_http_client()
+        results = []
+        for i in range(0, len(requests), META_BATCH_LIMIT):
             response = await client.post(
-                f"{META_GRAPH_URL}/{campaign_id}",
-                params={"access_token": access_token},
-                json={"status": status},  # ACTIVE or PAUSED
+                META_GRAPH_URL,
+                data={
+                    "access_token": access_token,
+                    "batch": orjson.dumps(requests[i:i + META_BATCH_LIMIT]).decode(),
+                    "include_headers": "false",
+                },
             )
             response.raise_for_status()
-            return response.json()
+            results.extend(orjson.loads(response.content))
+        return results
 
     @staticmethod
-    def parse_conversions(actions: list[dict]) -> int:
-        """Extract purchase/conversion count from Meta actions array."""
-        if not actions:
-            return 0
-        for action in actions:
-            if action.get("action_type") in ("purchase", "offsite_conversion.fb_pixel_purchase"):
-                return int(action.get("value", 0))
-        return 0
+    def parse_purchases(actions: list[dict], action_values: list[dict]) -> tuple[int, float]:
+        """Extract purchase count and revenue from Meta actions/action_values arrays."""
+        return (
+            int(MetaAdsService._purchase_value(actions)),
+            float(MetaAdsService._purchase_value(action_values)),
+        )
 
     @staticmethod
-    def parse_revenue(action_values: list[dict]) -> float:
-        """Extract revenue from Meta action_values array."""
-        if not action_values:
-            return 0.0
-        for av in action_values:
-            if av.get("action_type") in ("purchase", "offsite_conversion.fb_pixel_purchase"):
-                return float(av.get("value", 0))
-        return 0.0
+    def _purchase_value(entries: list[dict]):
+        """Value of the canonical purchase entry, falling back to the pixel-only count."""
+        # Meta repeats each event under several action_types; "purchase" is the
+        # deduplicated total, so it wins over the pixel variant wherever it appears
+        fallback = 0
+        for entry in entries or ():
+            action_type = entry.get("action_type")
+            if action_type == PURCHASE_ACTION_TYPE:
+                return entry.get("value", 0)
+            if action_type == PIXEL_PURCHASE_ACTION_TYPE and not fallback:
+                fallback = entry.get("value", 0)
+        return fallback
@@ -1,9 +1,12 @@
 """Optimization Engine - daily automated campaign optimization."""
 
+import asyncio
 import logging
+from collections import defaultdict
 from datetime import date, timedelta
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy import select, insert, func, or_, and_
+from sqlalchemy.orm import joinedload
 
 from app.models.client import Client, AutomationStatus
 from app.models.ad_account import AdAccount
@@ -16,6 +19,8 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+PAUSE_MIN_SPEND = 50.0  # Spend with zero conversions that gets a campaign paused
+
 
 class Optimizer:
     """
@@ -34,19 +39,25 @@ class Optimizer:
         """Run optimization for all active clients."""
         async with self.session_factory() as db:
             result = await db.execute(
-                select(Client).where(
+                select(Client.id).where(
                     Client.automation_status == AutomationStatus.ACTIVE,
                     Client.is_active == True,
                 )
             )
-            clients = result.scalars().all()
+            client_ids = result.scalars().all()
 
-        for client in clients:
-            try:
-                await self.optimize_client(client.id)
-                logger.info(f"Optimization complete for client {client.id}")
-            except Exception as e:
-                logger.error(f"Optimization failed for client {client.id}: {e}")
+        # Clients are independent; bound concurrency to stay within the DB pool
+        semaphore = asyncio.Semaphore(settings.SCHEDULER_CLIENT_CONCURRENCY)
+
+        async def optimize(client_id):
+            async with semaphore:
+                try:
+                    await self.optimize_client(client_id)
+                    logger.info(f"Optimization complete for client {client_id}")
+                except Exception as e:
+                    logger.error(f"Optimization failed for client {client_id}: {e}")
+
+        await asyncio.gather(*(optimize(client_id) for client_id in client_ids))
 
     async def optimize_client(self, client_id):
         """Run all optimization rules for a single client."""
@@ -57,127 +68,224 @@ class Optimizer:
             if not client_obj:
                 return
 
-            # Get all active campaigns
+            # Get all active campaigns; the ad account rides along in the same query
             result = await db.execute(
-                select(Campaign).where(
+                select(Campaign)
+                .options(joinedload(Campaign.ad_account))
+                .where(
                     Campaign.client_id == client_id,
                     Campaign.status == "active",
                 )
             )
             campaigns = result.scalars().all()
+            if not campaigns:
+                return
+
+            # The rules only need a few figures per campaign; Postgres aggregates them
+            # and leaves out campaigns no rule would act on
+            result = await db.execute(self._recent_stats([campaign.id for campaign in campaigns]))
+            recent_stats = {row.campaign_id: row for row in result.all()}
+            if not recent_stats:
+                return
+
+            # Platform services are only built when a campaign on that platform needs one
+            google = None
+            if any(campaign.platform == "google" and campaign.id in recent_stats for campaign in campaigns):
+                google = GoogleAdsService(
+                    client_id=client_obj.google_client_id,
+                    client_secret=client_obj.google_client_secret,
+                    developer_token=client_obj.google_developer_token
+                )
 
+            # Meta changes are queued per campaign and sent in batch calls after the sweep
+            meta_updates = {}
+            logs = []
             for campaign in campaigns:
-                await self._optimize_campaign(db, client_obj, campaign)
+                stats = recent_stats.get(campaign.id)
+                if stats is not None:
+                    await self._optimize_campaign(logs, client_obj, campaign, stats, meta_updates, google)
 
-            await db.commit()
+            if meta_updates:
+                meta = MetaAdsService(
+                    app_id=client_obj.meta_app_id,
+                    app_secret=client_obj.meta_app_secret
+                )
+                await self._flush_meta_updates(meta, meta_updates)
 
-    async def _optimize_campaign(self, db: AsyncSession, client_obj: Client, campaign: Campaign):
-        """Apply optimization rules to a single campaign."""
-        today = date.today()
-
-        # Get last 3 days of metrics
-        result = await db.execute(
-            select(DailyMetrics).where(
-                DailyMetrics.campaign_id == campaign.id,
-                DailyMetrics.date >= today - timedelta(days=3),
-            ).order_by(DailyMetrics.date.desc())
-        )
-        recent_metrics = result.scalars().all()
+            # All of the client's logs go in as one bulk INSERT
+            if logs:
+                await db.execute(insert(OptimizationLog), logs)
 
-        if not recent_metrics:
-            return
+            await db.commit()
 
-        # Get ad account for API calls
-        result = await db.execute(
-            select(AdAccount).where(AdAccount.id == campaign.ad_account_id)
+    @staticmethod
+    def _recent_stats(campaign_ids):
+        """Per-campaign aggregates over the last 3 days of metrics."""
+        recency = func.row_number().over(
+            partition_by=DailyMetrics.campaign_id, order_by=DailyMetrics.date.desc()
+        )
+        recent = (
+            select(
+                DailyMetrics.campaign_id, DailyMetrics.roas, DailyMetrics.cpa,
+                DailyMetrics.spend, DailyMetrics.conversions, recency.label("recency"),
+            )
+            .where(
+                DailyMetrics.campaign_id.in_(campaign_ids),
+                DailyMetrics.date >= date.today() - timedelta(days=3),
+            )
+            .subquery()
+        )
+        days = func.count()
+        # ROAS streak is judged on the three most recent days only
+        recent_high_roas = func.bool_and(recent.c.roas > settings.DEFAULT_ROAS_THRESHOLD).filter(recent.c.recency <= 3)
+        avg_cpa = func.avg(recent.c.cpa)
+        total_spend = func.sum(recent.c.spend)
+        total_conversions = func.sum(recent.c.conversions)
+        return (
+            select(
+                recent.c.campaign_id,
+                days.label("days"),
+                recent_high_roas.label("recent_high_roas"),
+                avg_cpa.label("avg_cpa"),
+                total_spend.label("total_spend"),
+                total_conversions.label("total_conversions"),
+            )
+            .group_by(recent.c.campaign_id)
+            # Only campaigns at least one rule would act on come back
+            .having(or_(
+                and_(days >= 3, recent_high_roas),
+                avg_cpa > settings.DEFAULT_CPA_THRESHOLD,
+                and_(total_spend >= PAUSE_MIN_SPEND, total_conversions == 0),
+            ))
         )
-        account = result.scalar_one_or_none()
+
+    async def _optimize_campaign(
+        self, logs: list[dict], client_obj: Client, campaign: Campaign,
+        stats, meta_updates: dict, google: GoogleAdsService,
+    ):
+        """Apply optimization rules to a single campaign."""
+        # Ad account for API calls (eager-loaded with the campaign)
+        account = campaign.ad_account
         if not account:
             return
 
         # Rule 1: ROAS > 3 for 3 consecutive days → increase budget 20%
-        await self._rule_scale_winners(db, client_obj, campaign, recent_metrics, account)
+        await self._rule_scale_winners(logs, client_obj, campaign, stats, account, meta_updates, google)
 
         # Rule 2: CPA too high → decrease budget 15%
-        await self._rule_reduce_high_cpa(db, client_obj, campaign, recent_metrics, account)
+        await self._rule_reduce_high_cpa(logs, client_obj, campaign, stats, account, meta_updates, google)
 
         # Rule 3: High spend + 0 conversions → pause
-        await self._rule_pause_no_conversions(db, client_obj, campaign, recent_metrics, account)
+        await self._rule_pause_no_conversions(logs, client_obj, campaign, stats, account, meta_updates, google)
+
+    @staticmethod
+    def _queue_meta_update(
+        meta_updates: dict, campaign: Campaign, account: AdAccount, log: dict, **fields,
+    ):
+        """Queue a Meta campaign change; the log stays pending until the batch returns."""
+        update = meta_updates.setdefault(campaign.id, {
+            "campaign": campaign,
+            "access_token": account.access_token,
+            # Restored if Meta rejects the change
+            "original": {"daily_budget": campaign.daily_budget, "status": campaign.status},
+            "fields": {},
+            "logs": [],
+        })
+        # Later rules overwrite earlier ones, so each campaign gets one combined update
+        update["fields"].update(fields)
+        update["logs"].append(log)
+        log["status"] = "pending"
+
+    async def _flush_meta_updates(self, meta: MetaAdsService, meta_updates: dict):
+        """Send queued Meta campaign changes and settle their logs."""
+        by_token = defaultdict(list)
+        for update in meta_updates.values():
+            by_token[update["access_token"]].append(update)
+
+        for access_token, updates in by_token.items():
+            try:
+                results = await meta.submit_batch(access_token, [
+                    meta.campaign_update_request(
+                        update["campaign"].platform_campaign_id, **update["fields"]
+                    )
+                    for update in updates
+                ])
+            except Exception as e:
+                logger.error(f"Meta batch update failed: {e}")
+                results = [{"code": None, "body": str(e)}] * len(updates)
+
+            for update, result in zip(updates, results):
+                if result and result.get("code") == 200:
+                    for log in update["logs"]:
+                        log["status"] = "completed"
+                    continue
+
+                campaign = update["campaign"]
+                error = result.get("body") if result else "Not processed by Meta batch"
+                logger.error(f"Failed to update Meta campaign {campaign.name}: {error}")
+                campaign.daily_budget = update["original"]["daily_budget"]
+                campaign.status = update["original"]["status"]
+                for log in update["logs"]:
+                    log["status"] = "failed"
+                    log["error_message"] = error
 
     async def _rule_scale_winners(
-        self, db: AsyncSession, client_obj: Client, campaign: Campaign,
-        metrics: list[DailyMetrics], account: AdAccount,
+        self, logs: list[dict], client_obj: Client, campaign: Campaign,
+        stats, account: AdAccount,
+        meta_updates: dict, google: GoogleAdsService,
     ):
         """Scale budget for consistently high-performing campaigns."""
-        if len(metrics) < 3:
-            return
-
         # Check if ROAS > threshold for all 3 recent days
-        all_high_roas = all(m.roas > settings.DEFAULT_ROAS_THRESHOLD for m in metrics[:3])
-
-        if not all_high_roas:
+        if stats.days < 3 or not stats.recent_high_roas:
             return
 
         new_budget = campaign.daily_budget * (1 + settings.BUDGET_INCREASE_PCT)
         old_budget = campaign.daily_budget
 
         try:
+            log = {
+                "client_id": client_obj.id,
+                "campaign_id": campaign.id,
+                "action": "budget_increase",
+                "reason": f"ROAS > {settings.DEFAULT_ROAS_THRESHOLD} for 3 consecutive days",
+                "entity_type": "campaign",
+                "entity_id": campaign.platform_campaign_id,
+                "old_value": f"${old_budget:.2f}",
+                "new_value": f"${new_budget:.2f}",
+                "status": "completed",
+            }
             if campaign.platform == "meta":
-                meta = MetaAdsService(
-                    app_id=client_obj.meta_app_id,
-                    app_secret=client_obj.meta_app_secret
-                )
-                await meta.update_campaign_budget(
-                    campaign.platform_campaign_id, account.access_token, new_budget
+                self._queue_meta_update(
+                    meta_updates, campaign, account, log, daily_budget=int(new_budget * 100)
                 )
             elif campaign.platform == "google":
-                google = GoogleAdsService(
-                    client_id=client_obj.google_client_id,
-                    client_secret=client_obj.google_client_secret,
-                    developer_token=client_obj.google_developer_token
-                )
                 await google.update_campaign_budget(
                     account.account_id, account.access_token,
                     campaign.platform_campaign_id, int(new_budget * 1_000_000)
                 )
 
             campaign.daily_budget = new_budget
-
-            log = OptimizationLog(
-                client_id=client_obj.id,
-                campaign_id=campaign.id,
-                action="budget_increase",
-                reason=f"ROAS > {settings.DEFAULT_ROAS_THRESHOLD} for 3 consecutive days",
-                entity_type="campaign",
-                entity_id=campaign.platform_campaign_id,
-                old_value=f"${old_budget:.2f}",
-                new_value=f"${new_budget:.2f}",
-                status="completed",
-            )
-            db.add(log)
+            logs.append(log)
             logger.info(f"Scaled campaign {campaign.name}: ${old_budget:.2f} → ${new_budget:.2f}")
 
         except Exception as e:
             logger.error(f"Failed to scale campaign {campaign.name}: {e}")
-            log = OptimizationLog(
-                client_id=client_obj.id,
-                campaign_id=campaign.id,
-                action="budget_increase",
-                reason=f"ROAS > {settings.DEFAULT_ROAS_THRESHOLD} for 3 days",
-                status="failed",
-                error_message=str(e),
-            )
-            db.add(log)
+            logs.append({
+                "client_id": client_obj.id,
+                "campaign_id": campaign.id,
+                "action": "budget_increase",
+                "reason": f"ROAS > {settings.DEFAULT_ROAS_THRESHOLD} for 3 days",
+                "status": "failed",
+                "error_message": str(e),
+            })
 
     async def _rule_reduce_high_cpa(
-        self, db: AsyncSession, client_obj: Client, campaign: Campaign,
-        metrics: list[DailyMetrics], account: AdAccount,
+        self, logs: list[dict], client_obj: Client, campaign: Campaign,
+        stats, account: AdAccount,
+        meta_updates: dict, google: GoogleAdsService,
     ):
         """Reduce budget when CPA is too high."""
-        if not metrics:
-            return
-
-        avg_cpa = sum(m.cpa for m in metrics) / len(metrics)
+        avg_cpa = float(stats.avg_cpa or 0)
 
         if avg_cpa <= settings.DEFAULT_CPA_THRESHOLD or avg_cpa == 0:
             return
@@ -189,92 +297,68 @@ class Optimizer:
         new_budget = max(new_budget, 5.0)
 
         try:
+            log = {
+                "client_id": client_obj.id,
+                "campaign_id": campaign.id,
+                "action": "budget_decrease",
+                "reason": f"CPA (${avg_cpa:.2f}) exceeds threshold (${settings.DEFAULT_CPA_THRESHOLD:.2f})",
+                "entity_type": "campaign",
+                "entity_id": campaign.platform_campaign_id,
+                "old_value": f"${old_budget:.2f}",
+                "new_value": f"${new_budget:.2f}",
+                "status": "completed",
+            }
             if campaign.platform == "meta":
-                meta = MetaAdsService(
-                    app_id=client_obj.meta_app_id,
-                    app_secret=client_obj.meta_app_secret
-                )
-                await meta.update_campaign_budget(
-                    campaign.platform_campaign_id, account.access_token, new_budget
+                self._queue_meta_update(
+                    meta_updates, campaign, account, log, daily_budget=int(new_budget * 100)
                 )
             elif campaign.platform == "google":
-                google = GoogleAdsService(
-                    client_id=client_obj.google_client_id,
-                    client_secret=client_obj.google_client_secret,
-                    developer_token=client_obj.google_developer_token
-                )
                 await google.update_campaign_budget(
                     account.account_id, account.access_token,
                     campaign.platform_campaign_id, int(new_budget * 1_000_000)
                 )
 
             campaign.daily_budget = new_budget
-
-            log = OptimizationLog(
-                client_id=client_obj.id,
-                campaign_id=campaign.id,
-                action="budget_decrease",
-                reason=f"CPA (${avg_cpa:.2f}) exceeds threshold (${settings.DEFAULT_CPA_THRESHOLD:.2f})",
-                entity_type="campaign",
-                entity_id=campaign.platform_campaign_id,
-                old_value=f"${old_budget:.2f}",
-                new_value=f"${new_budget:.2f}",
-                status="completed",
-            )
-            db.add(log)
+            logs.append(log)
 
         except Exception as e:
             logger.error(f"Failed to reduce budget for {campaign.name}: {e}")
 
     async def _rule_pause_no_conversions(
-        self, db: AsyncSession, client_obj: Client, campaign: Campaign,
-        metrics: list[DailyMetrics], account: AdAccount,
+        self, logs: list[dict], client_obj: Client, campaign: Campaign,
+        stats, account: AdAccount,
+        meta_updates: dict, google: GoogleAdsService,
     ):
         """Pause campaigns with spend but zero conversions."""
-        if not metrics:
-            return
-
-        total_spend = sum(m.spend for m in metrics)
-        total_conversions = sum(m.conversions for m in metrics)
+        total_spend = float(stats.total_spend or 0)
+        total_conversions = stats.total_conversions or 0
 
         # Only trigger if spent more than $50 with 0 conversions
-        if total_conversions > 0 or total_spend < 50:
+        if total_conversions > 0 or total_spend < PAUSE_MIN_SPEND:
             return
 
         try:
+            log = {
+                "client_id": client_obj.id,
+                "campaign_id": campaign.id,
+                "action": "campaign_paused",
+                "reason": f"Spent ${total_spend:.2f} with 0 conversions in last {stats.days} days",
+                "entity_type": "campaign",
+                "entity_id": campaign.platform_campaign_id,
+                "old_value": "active",
+                "new_value": "paused",
+                "status": "completed",
+            }
             if campaign.platform == "meta":
-                meta = MetaAdsService(
-                    app_id=client_obj.meta_app_id,
-                    app_secret=client_obj.meta_app_secret
-                )
-                await meta.update_campaign_status(
-                    campaign.platform_campaign_id, account.access_token, "PAUSED"
-                )
+                self._queue_meta_update(meta_updates, campaign, account, log, status="PAUSED")
             elif campaign.platform == "google":
-                google = GoogleAdsService(
-                    client_id=client_obj.google_client_id,
-                    client_secret=client_obj.google_client_secret,
-                    developer_token=client_obj.google_developer_token
-                )
                 await google.update_campaign_status(
                     account.account_id, account.access_token,
                     campaign.platform_campaign_id, "PAUSED"
                 )
 
             campaign.status = "paused"
-
-            log = OptimizationLog(
-                client_id=client_obj.id,
-                campaign_id=campaign.id,
-                action="campaign_paused",
-                reason=f"Spent ${total_spend:.2f} with 0 conversions in last {len(metrics)} days",
-                entity_type="campaign",
-                entity_id=campaign.platform_campaign_id,
-                old_value="active",
-                new_value="paused",
-                status="completed",
-            )
-            db.add(log)
+            logs.append(log)
             logger.info(f"Paused campaign {campaign.name} - no conversions")
 
         except Exception as e:
@@ -1,18 +1,36 @@
 """Strategy Engine - Rule-based campaign strategy generation."""
 
 import logging
-from datetime import date, timedelta
-import pandas as pd
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy import select
+from sqlalchemy import select, func
 
 from app.models.client import Client
 from app.models.daily_metrics import DailyMetrics
 from app.models.budget_settings import BudgetSettings
 from app.config import settings
+from app.utils.helpers import get_date_range
 
 logger = logging.getLogger(__name__)
 
+# Ad set split per campaign type as (type, budget_pct)
+_AD_SETS = {
+    "prospecting": (("broad", 0.40), ("interest", 0.35), ("lookalike", 0.25)),
+    "retargeting": (("website_visitors", 0.50), ("engaged_users", 0.30), ("cart_abandoners", 0.20)),
+    "testing": (("creative_test", 0.60), ("audience_test", 0.40)),
+}
+
+
+def _campaign_structure(daily_budgets: dict[str, float]) -> dict:
+    """Build the campaign structure from _AD_SETS with the given daily budgets."""
+    return {
+        campaign_type: {
+            "daily_budget": daily_budgets.get(campaign_type, 0),
+            "ad_sets": [{"type": ad_set_type, "budget_pct": pct} for ad_set_type, pct in ad_sets],
+        }
+        for campaign_type, ad_sets in _AD_SETS.items()
+    }
+
 
 class StrategyEngine:
     """
@@ -26,54 +44,77 @@ class StrategyEngine:
     async def generate_strategy(self, client_id) -> dict:
         """Generate a full campaign strategy for a client."""
         async with self.session_factory() as db:
-            # Load last 30 days of metrics
-            end_date = date.today() - timedelta(days=1)
-            start_date = end_date - timedelta(days=29)
-
-            result = await db.execute(
-                select(DailyMetrics).where(
-                    DailyMetrics.client_id == client_id,
-                    DailyMetrics.date >= start_date,
-                    DailyMetrics.date <= end_date,
-                )
-            )
-            rows = result.scalars().all()
+            result = await db.execute(self._metrics_totals().where(DailyMetrics.client_id == client_id))
+            totals = result.one_or_none()
 
-            if not rows:
+            if totals is None:
                 return self._default_strategy(client_id)
 
-            # Convert to DataFrame for analysis
-            df = pd.DataFrame([{
-                "date": r.date,
-                "campaign_id": str(r.campaign_id) if r.campaign_id else None,
-                "platform": r.platform,
-                "spend": r.spend,
-                "impressions": r.impressions,
-                "clicks": r.clicks,
-                "ctr": r.ctr,
-                "conversions": r.conversions,
-                "revenue": r.revenue,
-                "roas": r.roas,
-                "cpa": r.cpa,
-                "frequency": r.frequency or 0,
-            } for r in rows])
-
             # Get budget settings
             budget_result = await db.execute(
                 select(BudgetSettings).where(BudgetSettings.client_id == client_id)
             )
             budget = budget_result.scalar_one_or_none()
 
-            return self._analyze_and_recommend(df, budget)
+            return self._analyze_and_recommend(totals, budget)
+
+    async def generate_strategies(self, client_ids) -> dict:
+        """Generate strategies for many clients with one metrics and one budget query."""
+        if not client_ids:
+            return {}
+
+        async with self.session_factory() as db:
+            result = await db.execute(self._metrics_totals().where(DailyMetrics.client_id.in_(client_ids)))
+            totals_by_client = {row.client_id: row for row in result.all()}
+
+            budgets = {}
+            if totals_by_client:
+                result = await db.execute(
+                    select(BudgetSettings).where(BudgetSettings.client_id.in_(list(totals_by_client)))
+                )
+                budgets = {budget.client_id: budget for budget in result.scalars()}
+
+        return {
+            client_id: (
+                self._analyze_and_recommend(totals_by_client[client_id], budgets.get(client_id))
+                if client_id in totals_by_client
+                else self._default_strategy(client_id)
+            )
+            for client_id in client_ids
+        }
+
+    @staticmethod
+    def _metrics_totals():
+        """Per-client aggregates over the last 30 days; callers add the client filter."""
+        start_date, end_date = get_date_range(30)
+
+        # The rules only read a few scalars; let Postgres reduce the 30 days
+        return (
+            select(
+                DailyMetrics.client_id,
+                func.sum(DailyMetrics.spend).label("total_spend"),
+                func.sum(DailyMetrics.revenue).label("total_revenue"),
+                func.avg(DailyMetrics.ctr).label("avg_ctr"),
+                func.avg(DailyMetrics.cpa).label("avg_cpa"),
+                func.avg(func.coalesce(DailyMetrics.frequency, 0)).label("avg_frequency"),
+                func.count().label("row_count"),
+                func.count().filter(DailyMetrics.roas > 4.0).label("high_roas_count"),
+            )
+            .where(
+                DailyMetrics.date >= start_date,
+                DailyMetrics.date <= end_date,
+            )
+            .group_by(DailyMetrics.client_id)
+        )
 
-    def _analyze_and_recommend(self, df: pd.DataFrame, budget: BudgetSettings) -> dict:
+    def _analyze_and_recommend(self, totals: Row, budget: BudgetSettings) -> dict:
         """Core analysis logic."""
-        total_spend = df["spend"].sum()
-        total_revenue = df["revenue"].sum()
+        total_spend = totals.total_spend or 0
+        total_revenue = totals.total_revenue or 0
         overall_roas = total_revenue / total_spend if total_spend > 0 else 0
-        avg_ctr = df["ctr"].mean()
-        avg_cpa = df["cpa"].mean()
-        avg_frequency = df["frequency"].mean()
+        avg_ctr = totals.avg_ctr or 0
+        avg_cpa = totals.avg_cpa or 0
+        avg_frequency = totals.avg_frequency or 0
 
         # ─── Budget Allocation Recommendations ───────────────────
         prospecting_pct = budget.prospecting_pct if budget else 0.50
@@ -82,8 +123,7 @@ class StrategyEngine:
 
         # Rule: If retargeting ROAS > 4, increase retargeting allocation
         # (Approximate by looking at high-ROAS campaigns)
-        high_roas_campaigns = df[df["roas"] > 4.0]
-        if len(high_roas_campaigns) > len(df) * 0.3:
+        if totals.high_roas_count > totals.row_count * 0.3:
             retargeting_pct = min(retargeting_pct + 0.05, 0.50)
             prospecting_pct = max(prospecting_pct - 0.05, 0.30)
 
@@ -115,31 +155,11 @@ class StrategyEngine:
         monthly_budget = budget.monthly_cap if budget else 0
         daily_budget = monthly_budget / 30 if monthly_budget > 0 else 0
 
-        campaign_structure = {
-            "prospecting": {
-                "daily_budget": daily_budget * prospecting_pct,
-                "ad_sets": [
-                    {"type": "broad", "budget_pct": 0.40},
-                    {"type": "interest", "budget_pct": 0.35},
-                    {"type": "lookalike", "budget_pct": 0.25},
-                ],
-            },
-            "retargeting": {
-                "daily_budget": daily_budget * retargeting_pct,
-                "ad_sets": [
-                    {"type": "website_visitors", "budget_pct": 0.50},
-                    {"type": "engaged_users", "budget_pct": 0.30},
-                    {"type": "cart_abandoners", "budget_pct": 0.20},
-                ],
-            },
-            "testing": {
-                "daily_budget": daily_budget * testing_pct,
-                "ad_sets": [
-                    {"type": "creative_test", "budget_pct": 0.60},
-                    {"type": "audience_test", "budget_pct": 0.40},
-                ],
-            },
-        }
+        campaign_structure = _campaign_structure({
+            "prospecting": daily_budget * prospecting_pct,
+            "retargeting": daily_budget * retargeting_pct,
+            "testing": daily_budget * testing_pct,
+        })
 
         return {
             "client_id": str(budget.client_id) if budget else None,
@@ -173,31 +193,7 @@ class StrategyEngine:
                 "retargeting_pct": 0.35,
                 "testing_pct": 0.15,
             },
-            "campaign_structure": {
-                "prospecting": {
-                    "daily_budget": 0,
-                    "ad_sets": [
-                        {"type": "broad", "budget_pct": 0.40},
-                        {"type": "interest", "budget_pct": 0.35},
-                        {"type": "lookalike", "budget_pct": 0.25},
-                    ],
-                },
-                "retargeting": {
-                    "daily_budget": 0,
-                    "ad_sets": [
-                        {"type": "website_visitors", "budget_pct": 0.50},
-                        {"type": "engaged_users", "budget_pct": 0.30},
-                        {"type": "cart_abandoners", "budget_pct": 0.20},
-                    ],
-                },
-                "testing": {
-                    "daily_budget": 0,
-                    "ad_sets": [
-                        {"type": "creative_test", "budget_pct": 0.60},
-                        {"type": "audience_test", "budget_pct": 0.40},
-                    ],
-                },
-            },
+            "campaign_structure": _campaign_structure({}),
             "creative_flags": [],
             "monthly_budget": 0,
             "daily_budget": 0,
@@ -0,0 +1,71 @@
+"""Token Refresher - renews platform access tokens before they expire."""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy import select, or_
+from sqlalchemy.orm import joinedload
+
+from app.models.ad_account import AdAccount
+from app.services.google_ads import GoogleAdsService
+from app.utils.helpers import token_expiry
+
+logger = logging.getLogger(__name__)
+
+# Must exceed the refresh job's interval so no token lapses between runs
+TOKEN_REFRESH_MARGIN = timedelta(minutes=30)
+
+
+class TokenRefresher:
+    """
+    Refreshes Google Ads access tokens (valid for one hour) in the background,
+    so syncs and optimizations always find a live token on the account.
+    Meta long-lived tokens last ~60 days and can only be renewed by the user
+    reconnecting; their expiry is recorded at connect time.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker):
+        self.session_factory = session_factory
+
+    async def refresh_expiring_tokens(self):
+        """Refresh every connected Google account token that is close to expiry."""
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) + TOKEN_REFRESH_MARGIN
+
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(AdAccount)
+                .options(joinedload(AdAccount.client))
+                .where(
+                    AdAccount.platform == "google",
+                    AdAccount.status == "connected",
+                    AdAccount.refresh_token.is_not(None),
+                    or_(AdAccount.token_expires_at.is_(None), AdAccount.token_expires_at < cutoff),
+                )
+            )
+            accounts = result.scalars().all()
+
+            # One OAuth grant covers every customer it exposed; refresh each grant once
+            grants = defaultdict(list)
+            for account in accounts:
+                grants[(account.client_id, account.refresh_token)].append(account)
+
+            for (client_id, refresh_token), grant_accounts in grants.items():
+                client_obj = grant_accounts[0].client
+                google = GoogleAdsService(
+                    client_id=client_obj.google_client_id,
+                    client_secret=client_obj.google_client_secret,
+                    developer_token=client_obj.google_developer_token
+                )
+                try:
+                    token_data = await google.refresh_access_token(refresh_token)
+                except Exception as e:
+                    logger.error(f"Google token refresh failed for client {client_id}: {e}")
+                    continue
+
+                expires_at = token_expiry(token_data.get("expires_in"))
+                for account in grant_accounts:
+                    account.access_token = token_data["access_token"]
+                    account.token_expires_at = expires_at
+
+            await db.commit()
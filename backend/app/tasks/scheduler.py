@@ -11,10 +11,14 @@ from app.services.data_collector import DataCollector
 from app.services.optimizer import Optimizer
 from app.services.strategy_engine import StrategyEngine
 from app.services.budget_manager import BudgetManager
+from app.services.token_refresher import TokenRefresher
 
 logger = logging.getLogger(__name__)
 
-scheduler = AsyncIOScheduler()
+# Coroutine jobs run directly on the event loop (AsyncIOExecutor). A run that
+# starts late because the loop was busy still fires instead of being dropped
+# after the 1s default grace, and backed-up runs collapse into one.
+scheduler = AsyncIOScheduler(job_defaults={"coalesce": True, "misfire_grace_time": 300})
 
 
 async def job_sync_data():
@@ -43,20 +47,23 @@ async def job_weekly_strategy():
 
     async with AsyncSessionLocal() as db:
         result = await db.execute(
-            select(Client).where(
+            select(Client.id).where(
                 Client.automation_status == AutomationStatus.ACTIVE,
                 Client.is_active == True,
             )
         )
-        clients = result.scalars().all()
+        client_ids = result.scalars().all()
 
+    # Two queries for all clients instead of two per client
     engine = StrategyEngine(AsyncSessionLocal)
-    for client in clients:
-        try:
-            strategy = await engine.generate_strategy(client.id)
-            logger.info(f"Strategy updated for client {client.id}: ROAS target = {strategy.get('overall_metrics', {})}")
-        except Exception as e:
-            logger.error(f"Strategy generation failed for client {client.id}: {e}")
+    try:
+        strategies = await engine.generate_strategies(client_ids)
+    except Exception as e:
+        logger.error(f"Strategy generation failed: {e}")
+        return
+
+    for client_id, strategy in strategies.items():
+        logger.info(f"Strategy updated for client {client_id}: ROAS target = {strategy.get('overall_metrics', {})}")
 
     logger.info("Weekly strategy recalculation completed.")
 
@@ -69,6 +76,12 @@ async def job_budget_check():
     logger.info("Budget safety check completed.")
 
 
+async def job_refresh_tokens():
+    """Refresh platform access tokens ahead of expiry."""
+    refresher = TokenRefresher(AsyncSessionLocal)
+    await refresher.refresh_expiring_tokens()
+
+
 def start_scheduler():
     """Start the APScheduler with all scheduled jobs."""
     # Daily data sync at 2:00 AM
@@ -107,8 +120,17 @@ def start_scheduler():
         replace_existing=True,
     )
 
+    # Token refresh every 20 minutes (within TOKEN_REFRESH_MARGIN)
+    scheduler.add_job(
+        job_refresh_tokens,
+        IntervalTrigger(minutes=20),
+        id="token_refresh",
+        name="Access Token Refresh",
+        replace_existing=True,
+    )
+
     scheduler.start()
-    logger.info("Scheduler started with 4 jobs: data_sync, optimization, strategy, budget_check")
+    logger.info("Scheduler started with 5 jobs: data_sync, optimization, strategy, budget_check, token_refresh")
 
 
 def shutdown_scheduler():
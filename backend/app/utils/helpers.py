@@ -1,6 +1,6 @@
 """General helper utilities."""
 
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, timezone
 from typing import Optional
 
 
@@ -11,6 +11,13 @@ def get_date_range(days_back: int = 7) -> tuple[date, date]:
     return start_date, end_date
 
 
+def token_expiry(expires_in: Optional[int]) -> Optional[datetime]:
+    """Naive UTC time an OAuth token issued now with ``expires_in`` seconds expires."""
+    if not expires_in:
+        return None
+    return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=int(expires_in))
+
+
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
     """Safely divide two numbers, returning default on division by zero."""
     if denominator == 0:
@@ -0,0 +1,80 @@
+"""Shared outbound HTTP client."""
+
+import asyncio
+import logging
+import random
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+# Throttling and transient upstream failures worth another attempt
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.5  # seconds
+RETRY_MAX_DELAY = 8.0  # seconds
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use.
+
+    Reusing one client keeps connections (and their TLS sessions) alive
+    between calls instead of handshaking on every request. With HTTP/2,
+    concurrent calls to the same API host share a single connection.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=settings.HTTP_HTTP2,
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _client
+
+
+async def close_http_client():
+    """Close the shared client; called on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Seconds to wait before the next attempt: Retry-After if given, else jittered backoff."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), RETRY_MAX_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+
+
+async def request_with_retry(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request on the shared client, retrying throttling, 5xx and connection errors.
+
+    Only use this for idempotent reads; mutations could be applied twice.
+    The final response is returned as-is, so callers still raise_for_status().
+    """
+    client = get_http_client()
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt == RETRY_ATTEMPTS:
+                raise
+            delay = _retry_delay(attempt)
+            logger.warning(f"{method} {url} failed ({e!r}), retrying in {delay:.1f}s")
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == RETRY_ATTEMPTS:
+                return response
+            delay = _retry_delay(attempt, response)
+            logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
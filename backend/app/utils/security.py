@@ -1,53 +1,91 @@
 """Security utilities - JWT tokens and password hashing."""
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
+import functools
+import secrets
+import time
 import uuid
 
+import bcrypt
 import jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.config import settings
 from app.database import get_db
+from app.models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security_scheme = HTTPBearer()
 
+# A token's subject is parsed on every request it is sent with
+_parse_user_id = functools.lru_cache(maxsize=10_000)(uuid.UUID)
+
+# HMAC key bytes, encoded once instead of by PyJWT on every sign/verify
+_JWT_KEY = settings.JWT_SECRET_KEY.encode()
+_DEFAULT_TOKEN_LIFETIME = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60  # seconds
+
+# Every authenticated request resolves its user; reuse recent lookups across
+# requests. Cached users are detached and only read (id, email, is_active, ...),
+# so a deactivation takes effect within the TTL.
+USER_CACHE_TTL_SECONDS = 30
+USER_CACHE_MAX_ENTRIES = 50_000
+_user_cache: dict[uuid.UUID, tuple[float, User]] = {}
+
+
+# bcrypt only reads the first 72 bytes; truncate explicitly as passlib did
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
 
 def hash_password(password: str) -> str:
-    """Hash a plain-text password."""
-    return pwd_context.hash(password)
+    """Hash a plain-text password. CPU-bound; async callers run it in a thread."""
+    return bcrypt.hashpw(
+        password.encode()[:BCRYPT_MAX_PASSWORD_BYTES], bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    ).decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain-text password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(plain_password.encode()[:BCRYPT_MAX_PASSWORD_BYTES], hashed_password.encode())
+    except ValueError:
+        # Malformed stored hash
+        return False
 
 
 def create_access_token(user_id: str, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
-    expire = datetime.utcnow() + (
-        expires_delta or timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
+    # Claims as epoch seconds, which is what PyJWT would convert datetimes to
+    issued_at = int(time.time())
+    lifetime = int(expires_delta.total_seconds()) if expires_delta else _DEFAULT_TOKEN_LIFETIME
     payload = {
         "sub": str(user_id),
-        "exp": expire,
-        "iat": datetime.utcnow(),
-        "jti": str(uuid.uuid4()),
+        "exp": issued_at + lifetime,
+        "iat": issued_at,
+        "jti": secrets.token_hex(16),
     }
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return jwt.encode(payload, _JWT_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
+@functools.lru_cache(maxsize=10_000)
+def _verified_claims(token: str) -> dict:
+    """Signature-checked claims of a token; only tokens that verify are cached."""
+    return jwt.decode(token, _JWT_KEY, algorithms=[settings.JWT_ALGORITHM])
 
 
 def decode_access_token(token: str) -> dict:
-    """Decode and validate a JWT access token."""
+    """Decode and validate a JWT access token.
+
+    Clients send the same bearer token on every request, so the HMAC check
+    runs once per token; expiry is re-checked on each call. The returned
+    claims are shared between calls and must not be mutated.
+    """
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = _verified_claims(token)
+        # The token may have expired since it was first verified and cached
+        if payload.get("exp") is not None and payload["exp"] <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -64,20 +102,28 @@ def decode_access_token(token: str) -> dict:
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
     db: AsyncSession = Depends(get_db),
-):
+) -> User:
     """FastAPI dependency to get the current authenticated user."""
-    from app.models.user import User
-
     payload = decode_access_token(credentials.credentials)
-    user_id = payload.get("sub")
-    if not user_id:
+    try:
+        user_uuid = _parse_user_id(payload["sub"])
+    except (KeyError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
 
-    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-    user = result.scalar_one_or_none()
+    cached = _user_cache.get(user_uuid)
+    if cached and cached[0] > time.monotonic():
+        user = cached[1]
+    else:
+        user = await db.get(User, user_uuid)
+        if user:
+            # Shared across requests, so it must not belong to this one's session
+            db.expunge(user)
+            if len(_user_cache) >= USER_CACHE_MAX_ENTRIES:
+                _user_cache.clear()
+            _user_cache[user_uuid] = (time.monotonic() + USER_CACHE_TTL_SECONDS, user)
 
     if not user or not user.is_active:
         raise HTTPException(